@@ -1,72 +1,457 @@
 """Browser controller with Chromium support."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 import random
-from typing import Dict, Any, Optional, Literal, List
-from playwright.async_api import async_playwright, Page, Browser, Playwright
+import re
+from urllib.parse import SplitResult, urlsplit
+from typing import ClassVar, Dict, Any, Optional, Literal, List, Tuple
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Playwright, Locator, Route
+from playwright.async_api import TimeoutError as PWTimeout
 from browser_automation.utils.selectors import GoogleSelectors
 from browser_automation.utils.inspector import ElementInspector
 from browser_automation.utils.smart_selector import SmartSelector
 
 logger = logging.getLogger(__name__)
 
+# Reads everything needed to judge an element's interaction state in a single
+# round-trip. Keep this script read-only: a DOM or style write between the
+# layout reads would force the browser to reflow again.
+ELEMENT_STATE_SCRIPT = """
+(el) => {
+    const rect = el.getBoundingClientRect();
+    const cs = window.getComputedStyle(el);
+    const root = el.getRootNode();
+    const hitRoot = root.elementFromPoint ? root : document;
+    const hit = hitRoot.elementFromPoint(rect.left + rect.width / 2, rect.top + rect.height / 2);
+    
+    return {
+        rect: {x: rect.x, y: rect.y, width: rect.width, height: rect.height},
+        viewport: {width: window.innerWidth, height: window.innerHeight},
+        display: cs.display,
+        visibility: cs.visibility,
+        opacity: cs.opacity,
+        pointerEvents: cs.pointerEvents,
+        disabled: !!el.disabled,
+        ariaDisabled: el.getAttribute('aria-disabled') === 'true',
+        hitsElement: !!hit && (hit === el || el.contains(hit))
+    };
+}
+"""
+
+# Compares two rect reads 50ms apart; enough to rule out motion for elements
+# that are not animating
+RECT_STABLE_SCRIPT = """
+async (el) => {
+    const a = el.getBoundingClientRect();
+    await new Promise(resolve => setTimeout(resolve, 50));
+    const b = el.getBoundingClientRect();
+    return a.top === b.top && a.left === b.left && a.width === b.width && a.height === b.height;
+}
+"""
+
+# Single predicate covering document load and loading indicators. A complete
+# readyState means window load has fired, which already waits for images.
+# Only rendered indicators count, so hidden spinner templates and permanent
+# progress bars styled out of view do not hold the page back.
+PAGE_READY_SCRIPT = """
+() => {
+    if (document.readyState !== 'complete') return false;
+    const indicators = document.querySelectorAll('[class*="loading"], [class*="spinner"], [class*="progress"]');
+    for (const el of indicators) {
+        const visible = el.checkVisibility
+            ? el.checkVisibility({ visibilityProperty: true })
+            : el.offsetParent !== null;
+        if (visible) return false;
+    }
+    return true;
+}
+"""
+
+# Hides common overlay containers with CSS on every document, so clicks are
+# not intercepted and no per-retry removal script is needed
+HIDE_OVERLAYS_SCRIPT = """
+(() => {
+    const install = () => {
+        const style = document.createElement('style');
+        style.textContent = '.overlay, .popup, .modal { display: none !important; }';
+        document.documentElement.appendChild(style);
+    };
+    if (document.documentElement) {
+        install();
+    } else {
+        document.addEventListener('DOMContentLoaded', install, { once: true });
+    }
+})();
+"""
+
+# Tags each document with a unique token and counts its DOM mutations, so
+# cached page reads can detect a different or changed document. The counter
+# only exists once the observer is attached; before that nothing is cacheable.
+# Attributes are watched too: class, style and hidden changes alter innerText.
+MUTATION_COUNTER_SCRIPT = """
+(() => {
+    window.__docToken = performance.timeOrigin + ':' + Math.random().toString(36).slice(2);
+    const observe = () => {
+        window.__mutCount = 0;
+        new MutationObserver(() => { window.__mutCount++; }).observe(
+            document.documentElement,
+            { childList: true, subtree: true, characterData: true, attributes: true }
+        );
+    };
+    if (document.documentElement) {
+        observe();
+    } else {
+        document.addEventListener('DOMContentLoaded', observe, { once: true });
+    }
+})();
+"""
+
+# Human-like defaults applied to every page this controller opens
+DEFAULT_VIEWPORT = {"width": 1280, "height": 800}
+DEFAULT_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Sec-Ch-Ua": '"Chromium";v="122", "Not(A:Brand";v="24", "Google Chrome";v="122"',
+    "Sec-Ch-Ua-Mobile": "?0",
+    "Sec-Ch-Ua-Platform": '"macOS"',
+    "Upgrade-Insecure-Requests": "1"
+}
+
+# Budget in milliseconds for load-state waits used as a last resort; busy pages
+# may never reach networkidle, so these must fail fast
+LOAD_STATE_TIMEOUT = 2000
+
+# Upper bound in milliseconds for the exponential backoff between click retries
+MAX_RETRY_DELAY = 2000
+
+# Image URLs routed per context when image blocking is requested; anything
+# not matching is never intercepted
+IMAGE_URL_PATTERN = re.compile(r"\.(png|jpe?g|gif|svg|webp|avif|ico)(\?|$)", re.IGNORECASE)
+
+# Fonts, media and analytics beacons routed when asset blocking is requested
+BLOCKED_RESOURCE_TYPES = frozenset({"font", "media"})
+BLOCKED_HOSTS = frozenset({"google-analytics.com", "segment.io", "datadoghq.com", "sentry.io"})
+ASSET_URL_PATTERN = re.compile(
+    r"\.(woff2?|ttf|otf|eot|mp4|webm|ogg|mp3|wav|m4a)(\?|$)"
+    r"|^[a-z]+://([^/?#]*\.)?(" + "|".join(map(re.escape, sorted(BLOCKED_HOSTS))) + r")(:\d+)?/",
+    re.IGNORECASE
+)
+
 class BrowserController:
-    """Controls browser automation with Chromium."""
+    """
+    Controls browser automation with Chromium.
     
-    def __init__(self) -> None:
-        """Initialize the controller."""
+    All controllers in a process share one Playwright driver and one browser;
+    each controller owns its own context and page within it. Set
+    PLAYWRIGHT_CDP_ENDPOINT to attach to an already running browser instead
+    of launching one; its existing default context is then reused and left
+    open on close.
+    """
+    
+    _shared_playwright: ClassVar[Optional[Playwright]] = None
+    _shared_browser: ClassVar[Optional[Browser]] = None
+    _refcount: ClassVar[int] = 0
+    _generation: ClassVar[int] = 0
+    _shared_is_external: ClassVar[bool] = False
+    _shared_lock: ClassVar[Optional[asyncio.Lock]] = None
+    _shared_lock_loop: ClassVar[Optional[asyncio.AbstractEventLoop]] = None
+    
+    def __init__(self, page_load_timeout: int = 10000, storage_state_path: Optional[str] = None) -> None:
+        """
+        Initialize the controller.
+        
+        Args:
+            page_load_timeout: Maximum time to wait for a page to become ready in milliseconds
+            storage_state_path: File to restore cookies and localStorage from at launch
+                and save them to on close, so sessions survive restarts
+        """
+        self.page_load_timeout = page_load_timeout
+        self.storage_state_path = storage_state_path
         self._playwright: Optional[Playwright] = None
         self._browser: Optional[Browser] = None
+        self._context: Optional[BrowserContext] = None
+        self._owns_context = True
         self._page: Optional[Page] = None
+        self._result_texts_cache: Optional[Tuple[Tuple[str, int], List[str]]] = None
+        self._smart_selector: Optional[SmartSelector] = None
+        self._inspector: Optional[ElementInspector] = None
+        self._launch_options: Dict[str, bool] = {}
+        # Generation of the shared browser this controller holds a reference
+        # to, None while it holds none
+        self._browser_generation: Optional[int] = None
         
     @property
     def page(self) -> Optional[Page]:
         """Get current page."""
         return self._page
         
-    async def launch(self, headless: bool = False) -> bool:
+    async def launch(self, headless: bool = False, hide_overlays: bool = False, insecure: bool = False,
+                     block_images: bool = False, block_assets: bool = False) -> bool:
         """
-        Launch Chromium browser.
+        Launch Chromium browser, or join the one already shared by other controllers.
         
         Args:
-            headless: Whether to run browser in headless mode
+            headless: Whether to run browser in headless mode. Only applies when
+                this call starts the shared browser.
+            hide_overlays: Whether to hide .overlay, .popup and .modal elements on every page
+            insecure: Whether to disable site isolation and CSP for cross-origin script
+                injection. Site isolation only applies when this call starts the shared browser.
+            block_images: Whether to skip loading images. The renderer flag only applies
+                when this call starts the shared browser; image URLs are also aborted
+                by a context route so the option holds on an already running browser.
+            block_assets: Whether to abort font and media requests and requests to
+                known analytics hosts
             
         Returns:
             bool: True if launch successful, False otherwise
         """
         try:
-            self._playwright = await async_playwright().start()
-            
-            # Launch Chromium with specific options
-            self._browser = await self._playwright.chromium.launch(
-                channel="chrome-canary",
-                headless=headless,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-features=IsolateOrigins,site-per-process',
-                    '--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
-                ]
+            # Relaunching replaces the previous session rather than taking a
+            # second reference that close() would never give back
+            if self._browser_generation is not None:
+                await self.close()
+                
+            self._launch_options = {
+                'hide_overlays': hide_overlays,
+                'insecure': insecure,
+                'block_images': block_images,
+                'block_assets': block_assets
+            }
+            self._playwright, self._browser, self._browser_generation = await self._acquire_browser(
+                headless, insecure, block_images
             )
             
-            self._page = await self._browser.new_page()
+            if self._shared_is_external and self._browser.contexts:
+                # Reuse the external browser's default context rather than
+                # creating one; it belongs to that browser, so headers, scripts
+                # and routes go on our page instead
+                self._context = self._browser.contexts[0]
+                self._owns_context = False
+                self._page = await self._context.new_page()
+                await asyncio.gather(
+                    self._page.set_extra_http_headers(DEFAULT_HEADERS),
+                    self._page.set_viewport_size(DEFAULT_VIEWPORT),
+                    *self._page_setup(self._page)
+                )
+            else:
+                # Restore a saved session when there is one
+                storage_state = self.storage_state_path
+                if storage_state and not os.path.exists(storage_state):
+                    storage_state = None
+                    
+                self._owns_context = True
+                self._context, self._page = await self._new_context(storage_state)
+                
+            self._smart_selector = SmartSelector(self._page)
+            self._inspector = ElementInspector(self._page)
+                
             logger.info("Browser launched successfully")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to launch browser: {str(e)}")
+            logger.error("Failed to launch browser: %s", e)
+            
+            # Give back the shared browser reference taken before the failure,
+            # along with any context created before it. In an external context
+            # only the page we opened is ours to close.
+            generation, self._browser_generation = self._browser_generation, None
+            if generation is not None:
+                context = self._context if self._owns_context else None
+                if not context and self._page:
+                    try:
+                        await self._page.close()
+                    except Exception as close_error:
+                        logger.warning("Error closing page: %s", close_error)
+                self._browser = None
+                self._playwright = None
+                self._context = None
+                self._page = None
+                try:
+                    await self._release_browser(context, generation)
+                except Exception as release_error:
+                    logger.warning("Error releasing shared browser: %s", release_error)
             return False
             
-    async def navigate(self, url: str, wait_for: Literal['load', 'domcontentloaded', 'networkidle'] = 'networkidle') -> bool:
+    async def _new_context(self, storage_state: Optional[str] = None) -> Tuple[BrowserContext, Page]:
+        """
+        Create a context owned by this controller, with its page, init scripts and routes.
+        
+        Args:
+            storage_state: File to restore cookies and localStorage from, if any
+            
+        Returns:
+            Tuple[BrowserContext, Page]: The new context and its page
+        """
+        # Human-like viewport and headers are set once on the context
+        context = await self._browser.new_context(
+            viewport=DEFAULT_VIEWPORT,
+            bypass_csp=self._launch_options.get('insecure', False),
+            extra_http_headers=DEFAULT_HEADERS,
+            storage_state=storage_state
+        )
+        
+        # Page creation, init scripts and routes are independent round-trips
+        try:
+            results = await asyncio.gather(context.new_page(), *self._page_setup(context))
+        except Exception:
+            await context.close()
+            raise
+        return context, results[0]
+        
+    def _page_setup(self, target: Any) -> List[Any]:
+        """Init script and route registrations requested at launch, for a context or page."""
+        options = self._launch_options
+        setup = [target.add_init_script(MUTATION_COUNTER_SCRIPT)]
+        if options.get('hide_overlays'):
+            setup.append(target.add_init_script(HIDE_OVERLAYS_SCRIPT))
+        if options.get('block_images'):
+            setup.append(target.route(IMAGE_URL_PATTERN, self._abort_images))
+        if options.get('block_assets'):
+            setup.append(target.route(ASSET_URL_PATTERN, self._abort_assets))
+        return setup
+        
+    @staticmethod
+    async def _abort_images(route: Route) -> None:
+        """Abort image requests matched by IMAGE_URL_PATTERN, passing anything else on."""
+        if route.request.resource_type == "image":
+            await route.abort()
+        else:
+            await route.fallback()
+            
+    @staticmethod
+    async def _abort_assets(route: Route) -> None:
+        """Abort font, media and analytics requests matched by ASSET_URL_PATTERN."""
+        request = route.request
+        host = urlsplit(request.url).hostname or ""
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+            host == blocked or host.endswith("." + blocked) for blocked in BLOCKED_HOSTS
+        ):
+            await route.abort()
+        else:
+            await route.fallback()
+            
+    @classmethod
+    async def _acquire_browser(cls, headless: bool, insecure: bool = False,
+                               block_images: bool = False) -> Tuple[Playwright, Browser]:
+        """
+        Get the shared Playwright driver and browser, starting them if needed.
+        
+        Args:
+            headless: Whether to run browser in headless mode
+            insecure: Whether to launch with site isolation and web security disabled
+            block_images: Whether to disable image loading in the renderer
+            
+        Returns:
+            Tuple of the shared Playwright instance, browser and the browser's
+            generation, which must be passed back to _release_browser
+        """
+        async with cls._lock():
+            if cls._shared_browser is None or not cls._shared_browser.is_connected():
+                playwright = cls._shared_playwright or await async_playwright().start()
+                cls._shared_playwright = playwright
+                
+                endpoint = os.environ.get('PLAYWRIGHT_CDP_ENDPOINT')
+                cls._shared_is_external = bool(endpoint)
+                if endpoint:
+                    cls._shared_browser = await playwright.chromium.connect_over_cdp(endpoint)
+                else:
+                    args = [
+                        '--disable-blink-features=AutomationControlled',
+                        '--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
+                    ]
+                    if block_images:
+                        # Blink skips images itself, so no request is routed through Python
+                        args.append('--blink-settings=imagesEnabled=false')
+                    if insecure:
+                        # Falls back to in-process frames, which slows navigation
+                        args += [
+                            '--disable-web-security',
+                            '--disable-features=IsolateOrigins,site-per-process',
+                            '--disable-site-isolation-trials'
+                        ]
+                        
+                    # Launch Chromium with specific options
+                    cls._shared_browser = await playwright.chromium.launch(
+                        channel="chrome-canary",
+                        headless=headless,
+                        args=args
+                    )
+                # References to a disconnected browser are not carried over;
+                # their holders are told apart by generation on release
+                cls._generation += 1
+                cls._refcount = 0
+                
+            cls._refcount += 1
+            return cls._shared_playwright, cls._shared_browser, cls._generation
+            
+    @classmethod
+    def _lock(cls) -> asyncio.Lock:
+        """Lock guarding the shared browser, created for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if cls._shared_lock is None or cls._shared_lock_loop is not loop:
+            cls._shared_lock = asyncio.Lock()
+            cls._shared_lock_loop = loop
+        return cls._shared_lock
+        
+    @classmethod
+    async def _release_browser(cls, context: Optional[BrowserContext], generation: int) -> None:
+        """
+        Drop a reference to the shared browser, shutting it down with the last one.
+        
+        Args:
+            context: Context owned by the caller. It is closed only while other
+                controllers keep the browser alive; otherwise browser.close()
+                tears it down without a separate round-trip.
+            generation: Generation returned by _acquire_browser with the reference
+        """
+        async with cls._lock():
+            # The browser this reference belonged to has since been replaced;
+            # it is gone, and the current one's count is not ours to change
+            if generation != cls._generation:
+                return
+                
+            cls._refcount = max(cls._refcount - 1, 0)
+            if cls._refcount:
+                if context:
+                    try:
+                        await context.close()
+                    except Exception as e:
+                        logger.warning("Error during browser teardown: %s", e)
+                return
+                
+            browser, playwright = cls._shared_browser, cls._shared_playwright
+            cls._shared_browser = None
+            cls._shared_playwright = None
+            
+            try:
+                if browser:
+                    await browser.close()
+            finally:
+                # Playwright owns the transport, so it is always stopped last
+                if playwright:
+                    await playwright.stop()
+            
+    async def navigate(self, url: str,
+                       wait_for: Literal['commit', 'domcontentloaded', 'load', 'networkidle'] = 'domcontentloaded',
+                       simulate_human: bool = False) -> bool:
         """
         Navigate to URL and wait for specified state.
         
         Args:
             url: URL to navigate to
-            wait_for: State to wait for after navigation
+            wait_for: State to wait for after navigation. commit and
+                domcontentloaded return as soon as that state is reached; load
+                and networkidle also wait for loading indicators to clear.
+                networkidle is opt-in since it stalls on pages with analytics
+                or long-polling
+            simulate_human: Add a random 1-2s pause after loading
             
         Returns:
-            bool: True if navigation successful, False otherwise
+            bool: True if navigation successful and, for load and networkidle,
+                the page became ready; False otherwise
             
         Raises:
             ValueError: If browser not launched
@@ -75,34 +460,87 @@ class BrowserController:
             if not self._page:
                 raise ValueError("Browser not launched")
                 
-            # Set human-like viewport and window size
-            await self._page.set_viewport_size({"width": 1280, "height": 800})
-            
-            # Add human-like headers
-            await self._page.set_extra_http_headers({
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.9",
-                "Sec-Ch-Ua": '"Chromium";v="122", "Not(A:Brand";v="24", "Google Chrome";v="122"',
-                "Sec-Ch-Ua-Mobile": "?0",
-                "Sec-Ch-Ua-Platform": '"macOS"',
-                "Upgrade-Insecure-Requests": "1"
-            })
-            
+            # A fragment-only change stays in the current document, so skip
+            # the navigation round-trips and move the hash in place. Assigning
+            # location.hash (not replaceState) still scrolls to the anchor and
+            # fires hashchange for hash-routed apps.
+            target = urlsplit(url)
+            if target.fragment and self._document_key(target) == self._document_key(urlsplit(self._page.url)):
+                await self._page.evaluate("(hash) => { location.hash = hash; }", target.fragment)
+                logger.info("Successfully navigated to %s", url)
+                return True
+                
             # Navigate with a more natural timing
             await self._page.goto(url, wait_until=wait_for, timeout=30000)
-            await self._page.wait_for_load_state(wait_for)
             
-            # Add a small random delay to simulate human behavior
-            await self._page.wait_for_timeout(1000 + (random.random() * 1000))
+            # The readiness poll implies the load event, so it only runs when
+            # the caller asked for a fully loaded page
+            if wait_for in ('load', 'networkidle') and not await self._wait_for_page_ready():
+                logger.error("Navigated to %s but the page did not become ready", url)
+                return False
+            
+            if simulate_human:
+                await asyncio.sleep(1 + random.random())
             
-            logger.info(f"Successfully navigated to {url}")
+            logger.info("Successfully navigated to %s", url)
             return True
             
         except Exception as e:
-            logger.error(f"Navigation failed: {str(e)}")
+            logger.error("Navigation failed: %s", e)
+            return False
+            
+    @staticmethod
+    def _document_key(parts: SplitResult) -> Tuple[str, str, str, str]:
+        """URL components that identify a document: everything but the fragment."""
+        return parts.scheme, parts.netloc, parts.path, parts.query
+        
+    async def _wait_for_page_ready(self, timeout: Optional[int] = None) -> bool:
+        """
+        Poll until the page has loaded, with backoff between probes.
+        
+        Each probe is a single evaluate of PAGE_READY_SCRIPT. Polling starts at
+        100ms and doubles up to 800ms. networkidle is only used as a fallback
+        when the predicate does not hold before the timeout.
+        
+        Args:
+            timeout: Maximum time to wait in milliseconds, defaults to page_load_timeout
+            
+        Returns:
+            bool: True if page is ready, False otherwise
+        """
+        if not self._page:
+            raise ValueError("Browser not launched")
+            
+        if timeout is None:
+            timeout = self.page_load_timeout
+            
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout / 1000
+        interval = 0.1
+        
+        while True:
+            try:
+                if await self._page.evaluate(PAGE_READY_SCRIPT):
+                    return True
+            except Exception as e:
+                # Execution context is replaced while a navigation commits
+                logger.debug("Page ready probe failed: %s", e)
+                
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, 0.8)
+            
+        logger.debug("Page ready predicate timed out, falling back to networkidle")
+        try:
+            await self._page.wait_for_load_state('networkidle', timeout=LOAD_STATE_TIMEOUT)
+            return True
+        except PWTimeout as e:
+            logger.warning("Page did not become ready: %s", e)
             return False
             
-    async def wait_for_element(self, selector: str, timeout: int = 5000) -> bool:
+    async def wait_for_element(self, selector: str, timeout: int = 5000) -> Optional[Locator]:
         """
         Wait for element to be visible and ready.
         
@@ -111,22 +549,93 @@ class BrowserController:
             timeout: Maximum time to wait in milliseconds
             
         Returns:
-            bool: True if element found, False if timeout
+            Optional[Locator]: Locator for the selector if an element became
+                visible, None on timeout
         """
         try:
             if not self._page:
                 raise ValueError("Browser not launched")
                 
-            await self._page.wait_for_selector(selector, 
-                state='visible',
-                timeout=timeout
-            )
-            return True
+            locator = self._page.locator(selector)
+            # .first keeps the wait non-strict when the selector matches several elements
+            await locator.first.wait_for(state='visible', timeout=timeout)
+            return locator
         except Exception as e:
-            logger.error(f"Wait for element failed: {str(e)}")
-            return False
+            logger.error("Wait for element failed: %s", e)
+            return None
             
-    async def type_text(self, selector: str, text: str, submit: bool = False) -> bool:
+    async def wait_for_element_ready(self, element: Locator, ensure_visible: bool = True, timeout: int = 5000) -> Dict[str, Any]:
+        """
+        Wait for element to be visible and probe its interaction state.
+        
+        Visibility, enabled state, viewport position and overlay detection are
+        gathered in a single evaluate. Scrolling and the stability wait only
+        happen when the probe reports the element outside the viewport.
+        
+        Args:
+            element: Locator for the element
+            ensure_visible: Whether to scroll the element into the viewport
+            timeout: Maximum time to wait in milliseconds
+            
+        Returns:
+            Dict with visible, enabled, inViewport, obscured, pointerEvents and
+            rect of the element, plus a combined ready flag
+        """
+        await element.wait_for(state='visible', timeout=timeout)
+        state = self._element_state(await element.evaluate(ELEMENT_STATE_SCRIPT))
+        
+        if ensure_visible and not state['inViewport']:
+            await element.scroll_into_view_if_needed(timeout=timeout)
+            if not await element.evaluate(RECT_STABLE_SCRIPT):
+                handle = await element.element_handle(timeout=timeout)
+                await handle.wait_for_element_state('stable', timeout=1500)
+            state = self._element_state(await element.evaluate(ELEMENT_STATE_SCRIPT))
+            
+        return state
+        
+    @staticmethod
+    def _element_state(probe: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Derive interaction flags from a raw ELEMENT_STATE_SCRIPT probe.
+        
+        Args:
+            probe: Layout and style values read from the element
+            
+        Returns:
+            Dict with visible, enabled, inViewport, obscured, pointerEvents,
+            rect and a combined ready flag
+        """
+        rect = probe['rect']
+        viewport = probe['viewport']
+        
+        visible = (
+            rect['width'] > 0 and
+            rect['height'] > 0 and
+            probe['display'] != 'none' and
+            probe['visibility'] != 'hidden' and
+            probe['opacity'] != '0'
+        )
+        enabled = not probe['disabled'] and not probe['ariaDisabled']
+        in_viewport = (
+            rect['x'] >= 0 and
+            rect['y'] >= 0 and
+            rect['x'] + rect['width'] <= viewport['width'] and
+            rect['y'] + rect['height'] <= viewport['height']
+        )
+        obscured = visible and in_viewport and not probe['hitsElement']
+        
+        return {
+            'visible': visible,
+            'enabled': enabled,
+            'inViewport': in_viewport,
+            'obscured': obscured,
+            'pointerEvents': probe['pointerEvents'],
+            'rect': rect,
+            'ready': visible and enabled and not obscured and probe['pointerEvents'] != 'none'
+        }
+            
+    async def type_text(self, selector: str, text: str, submit: bool = False, timeout: int = 5000,
+                        success_selector: Optional[str] = None, success_timeout: int = 8000) -> bool:
         """
         Type text into an element with optional submit.
         
@@ -134,6 +643,10 @@ class BrowserController:
             selector: Element selector
             text: Text to type
             submit: Whether to press Enter after typing
+            timeout: Maximum time to wait for the element in milliseconds
+            success_selector: Element that appears once a submit has taken effect;
+                waited on instead of polling for page readiness
+            success_timeout: Maximum time to wait for success_selector in milliseconds
             
         Returns:
             bool: True if text entered successfully, False otherwise
@@ -145,26 +658,27 @@ class BrowserController:
             if not self._page:
                 raise ValueError("Browser not launched")
 
-            # Wait for element to be ready    
-            await self.wait_for_element(selector)
-            
-            # Type the text
+            # fill() waits for the element to be visible and editable itself
             element = self._page.locator(selector)
-            await element.fill(text)
+            await element.fill(text, timeout=timeout)
             
             if submit:
                 await element.press('Enter')
-                # Wait for navigation if submitting
-                await self._page.wait_for_load_state('networkidle')
+                # Wait for the content the caller needs if known, else for the page
+                if success_selector:
+                    await self._page.locator(success_selector).first.wait_for(state='visible', timeout=success_timeout)
+                else:
+                    await self._wait_for_page_ready()
                 
-            logger.info(f"Successfully typed text into {selector}")
+            logger.info("Successfully typed text into %s", selector)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to type text: {str(e)}")
+            logger.error("Failed to type text: %s", e)
             return False
             
-    async def click_with_retry(self, selector: str, ensure_visible: bool = True, max_attempts: int = 3, delay: int = 500) -> bool:
+    async def click_with_retry(self, selector: str, ensure_visible: bool = True, max_attempts: int = 3, delay: int = 500,
+                               force: bool = False) -> bool:
         """
         Click element with retry logic for better reliability.
         
@@ -172,7 +686,10 @@ class BrowserController:
             selector: Element selector to click
             ensure_visible: Whether to ensure element is in viewport
             max_attempts: Maximum number of retry attempts
-            delay: Delay between retries in milliseconds
+            delay: Initial delay between retries in milliseconds, doubled after each
+                attempt up to MAX_RETRY_DELAY, plus up to half of it as jitter
+            force: Whether to skip Playwright's actionability checks on retries,
+                which can click a covered or disabled element
             
         Returns:
             bool: True if click successful, False otherwise
@@ -183,33 +700,41 @@ class BrowserController:
         if not self._page:
             raise ValueError("Browser not launched")
             
+        # Get the element using locator (more reliable than wait_for_selector)
+        element = self._page.locator(selector)
+        
         for attempt in range(max_attempts):
             try:
-                # Get the element using locator (more reliable than wait_for_selector)
-                element = self._page.locator(selector)
-                
-                # Wait for element to be visible
-                await element.wait_for(state='visible', timeout=5000)
+                # Wait for element and probe its state in one pass
+                state = await self.wait_for_element_ready(element, ensure_visible=ensure_visible)
+                if not state['ready']:
+                    raise Exception(f"Element {selector} not ready for interaction: {state}")
                 
-                # Ensure element is in viewport if requested
-                if ensure_visible:
-                    await element.scroll_into_view_if_needed()
-                    await self._page.wait_for_timeout(100)  # Small delay after scroll
-                
-                # Attempt click
-                await element.click()
-                logger.info(f"Successfully clicked {selector} on attempt {attempt + 1}")
+                # Attempt click; Playwright re-checks actionability unless the
+                # caller opted into forcing retries
+                await element.click(force=force and attempt > 0, timeout=2000)
+                logger.info("Successfully clicked %s on attempt %s", selector, attempt + 1)
                 return True
                 
             except Exception as e:
-                logger.debug(f"Click attempt {attempt + 1} failed: {str(e)}")
+                logger.debug("Click attempt %s failed: %s", attempt + 1, e)
                 if attempt == max_attempts - 1:
-                    logger.error(f"Failed to click {selector} after {max_attempts} attempts")
+                    logger.error("Failed to click %s after %s attempts", selector, max_attempts)
                     return False
                     
-                # Ensure page is still available before waiting
-                if self._page:
-                    await self._page.wait_for_timeout(delay)
+                # The readiness wait already spent its timeout; retrying a
+                # click on an element that is not in the DOM cannot succeed
+                try:
+                    if not await element.count():
+                        logger.error("Failed to click %s: no matching element", selector)
+                        return False
+                except Exception:
+                    pass
+                    
+                # Back off locally instead of a wait_for_timeout round-trip;
+                # jitter keeps retries from parallel contexts out of lockstep
+                backoff = min(delay * (1 << attempt), MAX_RETRY_DELAY)
+                await asyncio.sleep((backoff + random.randint(0, delay // 2)) / 1000)
                 
         return False
             
@@ -235,7 +760,7 @@ class BrowserController:
             return await self.click_with_retry(selector, ensure_visible=ensure_visible)
             
         except Exception as e:
-            logger.error(f"Failed to click element: {str(e)}")
+            logger.error("Failed to click element: %s", e)
             return False
             
     async def wait_for_search_results(self, timeout: int = 5000) -> bool:
@@ -252,16 +777,16 @@ class BrowserController:
             if not self._page:
                 raise ValueError("Browser not launched")
                 
-            # Wait for main results container
-            await self.wait_for_element(GoogleSelectors.SEARCH['search_results'], timeout)
-            
-            # Wait for at least one organic result
-            await self.wait_for_element(GoogleSelectors.SEARCH['organic_results'], timeout)
+            # A visible organic result implies its container has rendered too
+            await self._page.locator(GoogleSelectors.SEARCH['organic_results']).first.wait_for(
+                state='visible',
+                timeout=timeout
+            )
             
             return True
             
         except Exception as e:
-            logger.error(f"Failed waiting for search results: {str(e)}")
+            logger.error("Failed waiting for search results: %s", e)
             return False
             
     async def get_result_count(self) -> int:
@@ -275,11 +800,11 @@ class BrowserController:
             if not self._page:
                 raise ValueError("Browser not launched")
                 
-            results = await self._page.query_selector_all(GoogleSelectors.SEARCH['organic_results'])
-            return len(results)
+            # count() returns the integer without materialising element handles
+            return await self._page.locator(GoogleSelectors.SEARCH['organic_results']).count()
             
         except Exception as e:
-            logger.error(f"Failed to get result count: {str(e)}")
+            logger.error("Failed to get result count: %s", e)
             return 0
             
     async def get_result_texts(self) -> List[str]:
@@ -293,17 +818,25 @@ class BrowserController:
             if not self._page:
                 raise ValueError("Browser not launched")
                 
-            titles = []
-            elements = await self._page.query_selector_all(GoogleSelectors.SEARCH['result_titles'])
-            
-            for element in elements:
-                title = await element.inner_text()
-                titles.append(title)
+            # Reuse the last result if the same document has not changed since
+            token, mutations = await self._page.evaluate(
+                "() => [window.__docToken ?? null, window.__mutCount ?? -1]"
+            )
+            key = (token, mutations)
+            if self._result_texts_cache and self._result_texts_cache[0] == key:
+                return list(self._result_texts_cache[1])
+                
+            # Read every title in one round-trip
+            titles = await self._page.locator(GoogleSelectors.SEARCH['result_titles']).all_inner_texts()
+                
+            # Without the token and counter there is no way to detect changes
+            if token is not None and mutations >= 0:
+                self._result_texts_cache = (key, list(titles))
                 
             return titles
             
         except Exception as e:
-            logger.error(f"Failed to get result texts: {str(e)}")
+            logger.error("Failed to get result texts: %s", e)
             return []
             
     async def click_result_by_index(self, index: int, ensure_visible: bool = True) -> bool:
@@ -334,23 +867,28 @@ class BrowserController:
         try:
             # Get element classes
             class_attr = await element.get_attribute('class')
-            if not class_attr:
-                return False
-                
-            # Determine result type
-            result_type = GoogleSelectors.get_result_type(class_attr)
-            
-            # Check if type is allowed
-            is_allowed = result_type in allowed_types
-            if not is_allowed:
-                logger.warning(f"Skipping result of type '{result_type}' (not in allowed types: {allowed_types})")
-            
-            return is_allowed
+            return self._is_allowed_result_type(class_attr, allowed_types)
             
         except Exception as e:
-            logger.error(f"Failed to verify result type: {str(e)}")
+            logger.error("Failed to verify result type: %s", e)
+            return False
+            
+    @staticmethod
+    def _is_allowed_result_type(class_attr: Optional[str], allowed_types: List[str]) -> bool:
+        """Check a result's class attribute against the allowed result types."""
+        if not class_attr:
             return False
             
+        # Determine result type
+        result_type = GoogleSelectors.get_result_type(class_attr)
+        
+        # Check if type is allowed
+        is_allowed = result_type in allowed_types
+        if not is_allowed:
+            logger.warning("Skipping result of type '%s' (not in allowed types: %s)", result_type, allowed_types)
+            
+        return is_allowed
+            
     async def click_result_by_text(self, text: str, ensure_visible: bool = True, allowed_types: List[str] = ['organic']) -> bool:
         """
         Click search result containing specified text using smart selection.
@@ -366,33 +904,36 @@ class BrowserController:
         if not self._page:
             raise ValueError("Browser not launched")
             
-        smart_selector = SmartSelector(self._page)
-        element = await smart_selector.find_element(
+        match = await self._smart_selector.find_best_match(
             target_text=text,
             element_type="link",
             context="search-results",
             attributes=["href", "class", "role"]
         )
         
-        if not element:
-            logger.error(f"Could not find result containing text: {text}")
+        if not match:
+            logger.error("Could not find result containing text: %s", text)
             return False
             
-        # Verify result type before clicking
-        if not await self.verify_result_type(element, allowed_types):
+        # Verify result type before clicking; the class was already read
+        # during the search, so this needs no round-trip
+        selector, candidate = match
+        if not self._is_allowed_result_type(candidate["attributes"].get("class"), allowed_types):
             return False
             
+        element = self._page.locator(selector)
+        
         try:
             if ensure_visible:
                 await element.scroll_into_view_if_needed()
-                await self._page.wait_for_timeout(500)  # Small delay after scroll
                 
+            # click() already waits for the element to be stable after scrolling
             await element.click()
-            logger.info(f"Successfully clicked result containing: {text}")
+            logger.info("Successfully clicked result containing: %s", text)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to click result: {str(e)}")
+            logger.error("Failed to click result: %s", e)
             return False
             
     async def inspect_page(self, 
@@ -424,14 +965,12 @@ class BrowserController:
             raise ValueError("Browser not launched")
             
         try:
-            inspector = ElementInspector(self._page)
-            
             if mode == 'clickable':
-                return await inspector.find_clickable_elements(max_elements)
+                return await self._inspector.find_clickable_elements(max_elements)
             elif mode == 'form':
-                return await inspector.find_form_elements(max_elements)
+                return await self._inspector.find_form_elements(max_elements)
             else:
-                return await inspector.inspect_page(
+                return await self._inspector.inspect_page(
                     selector=selector,
                     max_elements=max_elements,
                     element_types=element_types,
@@ -439,9 +978,46 @@ class BrowserController:
                     max_depth=max_depth
                 )
         except Exception as e:
-            logger.error(f"Failed to inspect page: {str(e)}")
+            logger.error("Failed to inspect page: %s", e)
             return {"error": str(e)}
             
+    async def reset_session(self) -> bool:
+        """
+        Start a signed-out session, keeping the browser warm.
+        
+        The context is replaced with a fresh one set up the same way as at
+        launch, so cookies, localStorage, sessionStorage and every other kind of
+        site data are gone, while repeated logins still skip browser startup.
+        A saved storage state is not restored. Only contexts this controller
+        created are reset; an external browser's context is left alone.
+        
+        Returns:
+            bool: True if the session was reset, False otherwise
+        """
+        if not self._context or not self._page or not self._owns_context:
+            return False
+            
+        try:
+            context, page = await self._new_context()
+        except Exception as e:
+            logger.error("Failed to reset session: %s", e)
+            return False
+            
+        old_context = self._context
+        self._context = context
+        self._page = page
+        self._result_texts_cache = None
+        self._smart_selector = SmartSelector(page)
+        self._inspector = ElementInspector(page)
+        
+        try:
+            await old_context.close()
+        except Exception as e:
+            logger.warning("Error closing previous context: %s", e)
+            
+        logger.info("Browser session reset")
+        return True
+        
     async def close(self) -> None:
         """
         Close browser and cleanup resources.
@@ -450,19 +1026,36 @@ class BrowserController:
             Exception: If cleanup fails
         """
         try:
-            if self._page:
-                await self._page.close()
-                self._page = None
-                
-            if self._browser:
-                await self._browser.close()
-                self._browser = None
-                
-            if self._playwright:
-                await self._playwright.stop()
-                self._playwright = None
+            # Persist the session before the context that holds it goes away
+            if self._context and self._owns_context and self.storage_state_path:
+                try:
+                    await self._context.storage_state(path=self.storage_state_path)
+                except Exception as e:
+                    logger.warning("Failed to save storage state: %s", e)
+                    
+            context = self._context if self._owns_context else None
+            if not context and self._page:
+                # Shared external context: only close the page we opened
+                try:
+                    await self._page.close()
+                except Exception as e:
+                    logger.warning("Error during browser teardown: %s", e)
+                    
+            self._context = None
+            self._page = None
+            self._result_texts_cache = None
+            self._smart_selector = None
+            self._inspector = None
+            
+            # The shared browser is only shut down by its last user, which
+            # also takes our context down with it
+            generation, self._browser_generation = self._browser_generation, None
+            self._browser = None
+            self._playwright = None
+            if generation is not None:
+                await self._release_browser(context, generation)
                 
             logger.info("Browser closed successfully")
         except Exception as e:
-            logger.error(f"Failed to close browser: {str(e)}")
+            logger.error("Failed to close browser: %s", e)
             raise
\ No newline at end of file
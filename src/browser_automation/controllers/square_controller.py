@@ -1,30 +1,85 @@
 """Square login controller."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from playwright.async_api import Page
+from typing import Dict, Tuple
+from playwright.async_api import Page, Locator, TimeoutError as PWTimeout
 
 logger = logging.getLogger(__name__)
 
+LOGIN_URL = 'https://app.squareupstaging.com/login'
+DASHBOARD_URL = 'https://app.squareupstaging.com/dashboard'
+
+# Stable CSS hooks for the login form, tried alongside the accessible role
+EMAIL_SEL = 'input[name="email"], input[type="email"], [data-testid="email-input"]'
+CONTINUE_SEL = '[data-testid="login-email-next-button"]'
+PASSWORD_SEL = 'input[name="password"], input[type="password"]'
+SIGN_IN_SEL = 'button[type="submit"]:has-text("Sign in")'
+
+# Dashboard shell that only renders for a signed-in user; a stale session is
+# routed back to the login form by the client instead
+DASHBOARD_SEL = '[data-testid="dashboard"], [data-testid="app-navigation"], nav[aria-label]'
+
+# How long the dashboard may take to settle on either the shell or the login form
+SESSION_CHECK_TIMEOUT = 5000
+
+# How long a native click may wait on actionability before the DOM fallback
+CLICK_TIMEOUT = 2000
+
+# Click an element directly, dispatching a synthetic event if click() throws
+DOM_CLICK_SCRIPT = """
+(el) => {
+    try {
+        el.click();
+        return 'click';
+    } catch (e) {}
+    el.dispatchEvent(new MouseEvent('click', { bubbles: true, cancelable: true, view: window }));
+    return 'dispatch';
+}
+"""
+
 class SquareController:
     """Controls Square-specific browser automation."""
     
-    def __init__(self, page: Page) -> None:
+    def __init__(self, page: Page, dashboard_selector: str = DASHBOARD_SEL) -> None:
         """
         Initialize with Playwright page.
         
         Args:
             page: Playwright page instance
+            dashboard_selector: Element that only renders for a signed-in user,
+                used to confirm a restored session
         """
         self.page = page
+        self.dashboard_selector = dashboard_selector
+        self._locator_cache: Dict[Tuple[str, str, str], Locator] = {}
+        
+    async def login_if_needed(self, email: str, password: str) -> bool:
+        """
+        Log in only when there is no usable session.
+        
+        Returns immediately when the page is already on the dashboard, then
+        tries any restored session before falling back to the login form.
+        
+        Args:
+            email: User's email
+            password: User's password
+            
+        Returns:
+            bool: True if logged in, False otherwise
+        """
+        return await self.login(email, password, reuse_session=True)
         
-    async def login(self, email: str, password: str) -> bool:
+    async def login(self, email: str, password: str, reuse_session: bool = False) -> bool:
         """
         Execute Square login flow.
         
         Args:
             email: User's email
             password: User's password
+            reuse_session: Try the dashboard first and skip the form if a restored
+                session is still valid
             
         Returns:
             bool: True if login successful, False otherwise
@@ -32,39 +87,58 @@ class SquareController:
         try:
             logger.info("Starting Square login flow")
             
-            # Navigate to login page
+            # Already signed in on this page; leaving it would only cost a navigation
+            if "/dashboard" in self.page.url:
+                logger.info("Already on dashboard, skipping login")
+                return True
+                
+            if reuse_session:
+                logger.info("Checking for an existing session")
+                try:
+                    await self.page.goto(DASHBOARD_URL, wait_until='domcontentloaded', timeout=SESSION_CHECK_TIMEOUT)
+                    if await self._has_session(timeout=SESSION_CHECK_TIMEOUT):
+                        logger.info("Existing session is valid, skipping login form")
+                        return True
+                except Exception as e:
+                    logger.debug("Session check failed: %s", e)
+                    
+            # Locators are lazy, so they are built once and reused across logins
+            email_input = self._form_locator(EMAIL_SEL, 'textbox', 'Email or phone number')
+            continue_button = self._form_locator(CONTINUE_SEL, 'button', 'Continue')
+            password_input = self._form_locator(PASSWORD_SEL, 'textbox', 'Password')
+            sign_in_button = self._form_locator(SIGN_IN_SEL, 'button', 'Sign in')
+            
+            # Navigate to login page; the email fill below waits for the form,
+            # so there is no need to wait for the load event
             logger.info("Navigating to login page")
-            await self.page.goto('https://app.squareupstaging.com/login')
+            await self.page.goto(LOGIN_URL, wait_until='commit')
             
             # Enter email
-            logger.info(f"Entering email: {email}")
-            email_input = self.page.get_by_role('textbox', name='Email or phone number')
+            logger.info("Entering email: %s", email)
             await email_input.fill(email)
             
-            # Click continue
+            # Click continue, waiting for the password field from the moment
+            # of the click so a fast transition is not missed
             logger.info("Clicking continue button")
-            continue_button = self.page.get_by_role('button', name='Continue')
-            await continue_button.click()
-            
-            # Wait for password field
-            logger.info("Waiting for password field")
-            await self.page.wait_for_timeout(1000)  # Give the page transition time
+            await asyncio.gather(
+                password_input.wait_for(state='visible', timeout=5000),
+                self._click(continue_button)
+            )
             
             # Enter password
             logger.info("Entering password")
-            password_input = self.page.get_by_role('textbox', name='Password')
             await password_input.fill(password)
             
-            # Click sign in
+            # Click sign in with the dashboard wait already registered; landing
+            # there is the success signal, networkidle would also wait out
+            # analytics traffic
             logger.info("Clicking sign in button")
-            sign_in_button = self.page.get_by_role('button', name='Sign in')
-            await sign_in_button.click()
-            
-            # Wait for navigation
-            await self.page.wait_for_load_state('networkidle')
+            verified, _ = await asyncio.gather(
+                self._verify_login(timeout=8000),
+                self._click(sign_in_button)
+            )
             
-            # Verify login success
-            if await self._verify_login():
+            if verified:
                 logger.info("Login successful")
                 return True
             else:
@@ -72,13 +146,80 @@ class SquareController:
                 return False
                 
         except Exception as e:
-            logger.error(f"Login failed: {str(e)}")
+            logger.error("Login failed: %s", e)
             return False
             
-    async def _verify_login(self) -> bool:
+    def _form_locator(self, css: str, role: str, name: str) -> Locator:
+        """
+        Locate a login form control by CSS, falling back to its accessible role.
+        
+        Args:
+            css: Stable CSS selector for the control
+            role: ARIA role used when no CSS match exists
+            name: Accessible name used with the role
+            
+        Returns:
+            Locator: First element matching either strategy
+        """
+        key = (css, role, name)
+        locator = self._locator_cache.get(key)
+        if locator is None:
+            locator = self.page.locator(css).or_(self.page.get_by_role(role, name=name)).first
+            self._locator_cache[key] = locator
+        return locator
+        
+    async def _click(self, locator: Locator) -> None:
+        """
+        Click a form control, falling back to a DOM click if it is not actionable.
+        
+        The native click gets a short timeout; when an overlay or animation keeps
+        the control from becoming clickable, a single evaluate clicks it directly.
+        
+        Args:
+            locator: Control to click
+        """
+        try:
+            await locator.click(timeout=CLICK_TIMEOUT)
+        except PWTimeout:
+            method = await locator.evaluate(DOM_CLICK_SCRIPT, timeout=CLICK_TIMEOUT)
+            logger.debug("Native click timed out, clicked via %s", method)
+            
+    async def _has_session(self, timeout: int) -> bool:
+        """
+        Check whether the dashboard just navigated to belongs to a signed-in user.
+        
+        The URL alone proves nothing right after navigating to it: a stale
+        session is redirected to the login form on the client. Whichever of the
+        dashboard shell and the login form renders first decides.
+        
+        Args:
+            timeout: Maximum time to wait for either in milliseconds
+            
+        Returns:
+            bool: True if the dashboard shell rendered, False otherwise
+        """
+        dashboard = self.page.locator(self.dashboard_selector)
+        login_form = self._form_locator(EMAIL_SEL, 'textbox', 'Email or phone number')
+        try:
+            await dashboard.or_(login_form).first.wait_for(state='visible', timeout=timeout)
+        except PWTimeout:
+            return False
+            
+        if "/dashboard" not in self.page.url:
+            return False
+        on_dashboard, on_login = await asyncio.gather(
+            dashboard.first.is_visible(),
+            login_form.is_visible()
+        )
+        return on_dashboard and not on_login
+        
+    async def _verify_login(self, timeout: int = 5000) -> bool:
         """
         Verify successful login.
         
+        Args:
+            timeout: Maximum time to wait for the dashboard URL in milliseconds
+            
         Returns:
             bool: True if login verified, False otherwise
         """
@@ -86,7 +227,7 @@ class SquareController:
             # Wait for URL change
             await self.page.wait_for_url(
                 "**/dashboard**",
-                timeout=5000
+                timeout=timeout
             )
             return True
         except Exception:
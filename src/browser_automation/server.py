@@ -23,6 +23,10 @@ logger = logging.getLogger(__name__)
 @dataclass
 class BrowserLaunchParams:
     headless: bool = False
+    hide_overlays: bool = False
+    insecure: bool = False
+    block_images: bool = False
+    block_assets: bool = False
 
 @dataclass
 class NavigateParams:
@@ -33,6 +37,7 @@ class TypeTextParams:
     selector: str
     text: str
     submit: bool = False
+    success_selector: Optional[str] = None
 
 @dataclass
 class ClickElementParams:
@@ -77,7 +82,13 @@ async def launch_browser(params: Dict[str, Any]) -> Dict[str, Any]:
     """Launch a new browser instance."""
     try:
         launch_params = BrowserLaunchParams(**params)
-        success = await browser_controller.launch(headless=launch_params.headless)
+        success = await browser_controller.launch(
+            headless=launch_params.headless,
+            hide_overlays=launch_params.hide_overlays,
+            insecure=launch_params.insecure,
+            block_images=launch_params.block_images,
+            block_assets=launch_params.block_assets
+        )
         return {
             "success": success,
             "message": "Browser launched successfully" if success else "Failed to launch browser"
@@ -124,7 +135,8 @@ async def type_text(params: Dict[str, Any]) -> Dict[str, Any]:
         success = await browser_controller.type_text(
             text_params.selector,
             text_params.text,
-            submit=text_params.submit
+            submit=text_params.submit,
+            success_selector=text_params.success_selector
         )
         return {
             "success": success,
@@ -239,14 +251,10 @@ async def google_search(params: Dict[str, Any]) -> Dict[str, Any]:
         await search_input.press('Enter')
         
         # Wait for results
-        await browser_controller.page.wait_for_timeout(2000)  # Initial load time
+        await browser_controller.wait_for_search_results(search_params.timeout)
         
         # Get search results
-        result_titles = []
-        elements = await browser_controller.page.query_selector_all('h3')
-        for element in elements:
-            title = await element.inner_text()
-            result_titles.append(title)
+        result_titles = await browser_controller.get_result_texts()
         
         # Click result if requested
         clicked = False
@@ -1,6 +1,26 @@
 """Base logger class for consistent logging across components."""
 import logging
-from typing import Optional
+from typing import Any, Callable, Optional
+
+class LazyArg:
+    """
+    Log argument computed only when a record is actually formatted.
+    
+    Wrap expensive values, e.g. ``LazyArg(lambda: json.dumps(state, indent=2))``,
+    so the work is skipped for disabled levels. Only wrapped values are
+    deferred; any other argument, callable or not, is logged as is.
+    """
+    
+    __slots__ = ('func',)
+    
+    def __init__(self, func: Callable[[], Any]) -> None:
+        self.func = func
+        
+    def __str__(self) -> str:
+        return str(self.func())
+        
+    def __repr__(self) -> str:
+        return repr(self.func())
 
 class BaseLogger:
     """Base class providing consistent logging functionality."""
@@ -27,22 +47,36 @@ class BaseLogger:
             self.logger.addHandler(handler)
             self.logger.setLevel(logging.DEBUG)
             
+    def _log(self, level: int, msg: str, args: tuple, kwargs: dict) -> None:
+        """
+        Log message if level is enabled.
+        
+        LazyArg arguments are only evaluated when the record is formatted.
+        The record is attributed to the caller of the public method, not to
+        this module.
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        # Skip this frame and the level method that called it
+        kwargs['stacklevel'] = kwargs.get('stacklevel', 1) + 2
+        self.logger.log(level, msg, *args, **kwargs)
+            
     def debug(self, msg: str, *args, **kwargs) -> None:
         """Log debug message."""
-        self.logger.debug(msg, *args, **kwargs)
+        self._log(logging.DEBUG, msg, args, kwargs)
         
     def info(self, msg: str, *args, **kwargs) -> None:
         """Log info message."""
-        self.logger.info(msg, *args, **kwargs)
+        self._log(logging.INFO, msg, args, kwargs)
         
     def warning(self, msg: str, *args, **kwargs) -> None:
         """Log warning message."""
-        self.logger.warning(msg, *args, **kwargs)
+        self._log(logging.WARNING, msg, args, kwargs)
         
     def error(self, msg: str, *args, **kwargs) -> None:
         """Log error message."""
-        self.logger.error(msg, *args, **kwargs)
+        self._log(logging.ERROR, msg, args, kwargs)
         
     def critical(self, msg: str, *args, **kwargs) -> None:
         """Log critical message."""
-        self.logger.critical(msg, *args, **kwargs)
\ No newline at end of file
+        self._log(logging.CRITICAL, msg, args, kwargs)
\ No newline at end of file
@@ -1,85 +1,59 @@
 """Element inspection and debugging utilities."""
 import json
 import logging
+import weakref
 from typing import Dict, Any, List, Optional
 from playwright.async_api import Page
+from browser_automation.utils.js import minify_js
 
 logger = logging.getLogger(__name__)
 
-class ElementInspector:
-    """Utility class for inspecting page elements."""
-    
-    def __init__(self, page: Page):
-        """Initialize with Playwright page object."""
-        self.page = page
-    
-    async def inspect_page(self, 
-                         selector: str = 'body',
-                         max_elements: int = 100,
-                         element_types: Optional[List[str]] = None,
-                         attributes: Optional[List[str]] = None,
-                         max_depth: int = 3) -> Dict[str, Any]:
-        """
-        Analyze page structure with configurable limits and filters.
-        
-        Args:
-            selector: Base selector to start inspection from
-            max_elements: Maximum number of elements to return
-            element_types: List of element types to include (e.g. ['a', 'button'])
-            attributes: List of attributes to include in results
-            max_depth: Maximum depth to traverse in DOM tree
-            
-        Returns:
-            Dict containing filtered page analysis
-        """
-        # Create a params object to pass to JavaScript
-        params = {
-            "selector": selector,
-            "maxElements": max_elements,
-            "elementTypes": element_types or ['*'],
-            "attributes": attributes or ['class', 'href', 'src', 'alt', 'title', 'role', 'aria-label'],
-            "maxDepth": max_depth
+# Inspection helpers installed once per page as window.__inspector; each
+# inspection is then a short call instead of shipping the full source
+INSPECTOR_BUNDLE = minify_js("""
+(() => {
+    // First `limit` characters of an element's trimmed text. Stops walking
+    // text nodes once enough is collected, where textContent would build the
+    // whole subtree's text (the entire page for the root element).
+    const textPreview = (element, limit) => {
+        const walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+        let text = '';
+        while (walker.nextNode()) {
+            text += walker.currentNode.nodeValue;
+            if (text.trimStart().length > limit) break;
         }
-        
-        script = """
-        (params) => {
+        return text.trimStart().slice(0, limit).trimEnd() || null;
+    };
+
+    window.__inspector = window.__inspector || {
+        inspectPage: (params) => {
             const {selector, maxElements, elementTypes, attributes, maxDepth} = params;
             let elementCount = 0;
-            
-            function analyzeElement(element, depth = 0) {
-                if (elementCount >= maxElements || depth >= maxDepth) {
-                    return null;
-                }
-                
-                if (elementTypes && !elementTypes.includes('*') && 
-                    !elementTypes.includes(element.tagName.toLowerCase())) {
-                    return null;
-                }
-                
-                elementCount++;
-                
+        
+            function describeElement(element) {
                 const info = {
                     tag: element.tagName.toLowerCase(),
                     id: element.id || null,
-                    text: element.textContent?.trim()?.slice(0, 100) || null,
+                    text: textPreview(element, 100),
                 };
-                
+            
                 if (attributes && attributes.length > 0) {
                     info.attributes = {};
-                    for (const attr of element.attributes) {
-                        if (attributes.includes(attr.name)) {
-                            info.attributes[attr.name] = attr.value;
+                    for (const name of attributes) {
+                        const value = element.getAttribute(name);
+                        if (value !== null) {
+                            info.attributes[name] = value;
                         }
                     }
                 }
-                
+            
                 info.isVisible = !(
                     element.style.display === 'none' || 
                     element.style.visibility === 'hidden' ||
                     element.style.opacity === '0' ||
                     element.offsetParent === null
                 );
-                
+            
                 if (info.isVisible) {
                     const rect = element.getBoundingClientRect();
                     info.position = {
@@ -95,28 +69,46 @@ class ElementInspector:
                         )
                     };
                 }
+            
+                return info;
+            }
+        
+            // Pre-order walk with an explicit stack, so the element budget is
+            // spent in document order without recursing per level. Elements of
+            // a filtered-out type are skipped along with their subtree.
+            function analyzeTree(root) {
+                let result = null;
+                const stack = [[root, 0, null]];
+                while (stack.length > 0 && elementCount < maxElements) {
+                    const [element, depth, parent] = stack.pop();
+                    if (elementTypes && !elementTypes.includes('*') && 
+                        !elementTypes.includes(element.tagName.toLowerCase())) {
+                        continue;
+                    }
                 
-                if (depth < maxDepth) {
-                    const children = [];
-                    for (const child of element.children) {
-                        const childInfo = analyzeElement(child, depth + 1);
-                        if (childInfo) {
-                            children.push(childInfo);
-                        }
+                    elementCount++;
+                    const info = describeElement(element);
+                    if (parent) {
+                        (parent.children = parent.children || []).push(info);
+                    } else {
+                        result = info;
                     }
-                    if (children.length > 0) {
-                        info.children = children;
+                
+                    if (depth + 1 < maxDepth) {
+                        const children = element.children;
+                        for (let i = children.length - 1; i >= 0; i--) {
+                            stack.push([children[i], depth + 1, info]);
+                        }
                     }
                 }
-                
-                return info;
+                return result;
             }
-            
+        
             const root = document.querySelector(selector);
             if (!root) {
                 return { error: `Element not found: ${selector}` };
             }
-            
+        
             return {
                 url: window.location.href,
                 title: document.title,
@@ -125,7 +117,7 @@ class ElementInspector:
                     width: window.innerWidth,
                     height: window.innerHeight
                 },
-                elements: analyzeElement(root),
+                elements: maxDepth > 0 ? analyzeTree(root) : null,
                 totalElements: elementCount,
                 filters: {
                     selector,
@@ -135,47 +127,18 @@ class ElementInspector:
                     maxDepth
                 }
             };
-        }
-        """
-        
-        try:
-            # Pass parameters as a single object
-            result = await self.page.evaluate(script, params)
-            
-            if 'error' in result:
-                logger.error(f"Page analysis error: {result['error']}")
-            else:
-                logger.debug(f"Analyzed {result['totalElements']} elements")
-                
-            return result
-            
-        except Exception as e:
-            logger.error(f"Page analysis failed: {str(e)}")
-            return {'error': str(e)}
-    
-    async def find_clickable_elements(self, max_elements: int = 50) -> Dict[str, Any]:
-        """
-        Find all clickable elements on the page.
-        
-        Args:
-            max_elements: Maximum number of elements to return
-            
-        Returns:
-            Dict containing clickable elements info
-        """
-        params = {"maxElements": max_elements}
-        
-        script = """
-        (params) => {
+        },
+
+        clickableElements: (params) => {
             const {maxElements} = params;
             const clickableElements = [];
             let elementCount = 0;
-            
+        
             const clickableSelectors = [
                 'a', 'button', 'input[type="submit"]', 'input[type="button"]',
                 '[role="button"]', '[onclick]', '[class*="btn"]', '[class*="button"]'
             ];
-            
+        
             function isVisible(element) {
                 return !!(
                     element.offsetWidth || 
@@ -183,21 +146,21 @@ class ElementInspector:
                     element.getClientRects().length
                 ) && window.getComputedStyle(element).visibility !== 'hidden';
             }
-            
+        
             const elements = document.querySelectorAll(clickableSelectors.join(','));
-            
+        
             for (const element of elements) {
                 if (elementCount >= maxElements) break;
-                
+            
                 if (isVisible(element)) {
                     const rect = element.getBoundingClientRect();
-                    
+                
                     if (rect.width > 0 && rect.height > 0) {
                         elementCount++;
                         clickableElements.push({
                             tag: element.tagName.toLowerCase(),
                             id: element.id || null,
-                            text: element.textContent?.trim()?.slice(0, 100) || null,
+                            text: textPreview(element, 100),
                             attributes: {
                                 class: element.className,
                                 href: element.href,
@@ -220,7 +183,7 @@ class ElementInspector:
                     }
                 }
             }
-            
+        
             return {
                 url: window.location.href,
                 timestamp: new Date().toISOString(),
@@ -231,36 +194,13 @@ class ElementInspector:
                 elements: clickableElements,
                 totalElements: elementCount
             };
-        }
-        """
-        
-        try:
-            result = await self.page.evaluate(script, params)
-            logger.debug(f"Found {result['totalElements']} clickable elements")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Failed to find clickable elements: {str(e)}")
-            return {'error': str(e)}
-    
-    async def find_form_elements(self, max_elements: int = 50) -> Dict[str, Any]:
-        """
-        Find all form input elements on the page.
-        
-        Args:
-            max_elements: Maximum number of elements to return
-            
-        Returns:
-            Dict containing form elements info
-        """
-        params = {"maxElements": max_elements}
-        
-        script = """
-        (params) => {
+        },
+
+        formElements: (params) => {
             const {maxElements} = params;
             const formElements = [];
             let elementCount = 0;
-            
+        
             const formSelectors = [
                 'input:not([type="hidden"])',
                 'textarea',
@@ -270,7 +210,7 @@ class ElementInspector:
                 '[role="listbox"]',
                 '[contenteditable="true"]'
             ];
-            
+        
             function isVisible(element) {
                 return !!(
                     element.offsetWidth || 
@@ -278,15 +218,15 @@ class ElementInspector:
                     element.getClientRects().length
                 ) && window.getComputedStyle(element).visibility !== 'hidden';
             }
-            
+        
             const elements = document.querySelectorAll(formSelectors.join(','));
-            
+        
             for (const element of elements) {
                 if (elementCount >= maxElements) break;
-                
+            
                 if (isVisible(element)) {
                     const rect = element.getBoundingClientRect();
-                    
+                
                     if (rect.width > 0 && rect.height > 0) {
                         elementCount++;
                         formElements.push({
@@ -325,7 +265,7 @@ class ElementInspector:
                     }
                 }
             }
-            
+        
             return {
                 url: window.location.href,
                 timestamp: new Date().toISOString(),
@@ -337,13 +277,115 @@ class ElementInspector:
                 totalElements: elementCount
             };
         }
+    };
+})();
+""")
+
+# Pages that already have INSPECTOR_BUNDLE registered
+_bundled_pages: "weakref.WeakSet[Page]" = weakref.WeakSet()
+
+class ElementInspector:
+    """Utility class for inspecting page elements."""
+    
+    def __init__(self, page: Page):
+        """Initialize with Playwright page object."""
+        self.page = page
+        
+    async def _ensure_bundle(self) -> None:
+        """Install the inspector helpers on the page if not already present."""
+        if self.page in _bundled_pages:
+            return
+            
+        # Init script covers future documents, evaluate covers the current one
+        await self.page.add_init_script(INSPECTOR_BUNDLE)
+        await self.page.evaluate(INSPECTOR_BUNDLE)
+        _bundled_pages.add(self.page)
+    
+    async def inspect_page(self, 
+                         selector: str = 'body',
+                         max_elements: int = 100,
+                         element_types: Optional[List[str]] = None,
+                         attributes: Optional[List[str]] = None,
+                         max_depth: int = 3) -> Dict[str, Any]:
+        """
+        Analyze page structure with configurable limits and filters.
+        
+        Args:
+            selector: Base selector to start inspection from
+            max_elements: Maximum number of elements to return
+            element_types: List of element types to include (e.g. ['a', 'button'])
+            attributes: List of attributes to include in results
+            max_depth: Maximum depth to traverse in DOM tree
+            
+        Returns:
+            Dict containing filtered page analysis
+        """
+        # Create a params object to pass to JavaScript
+        params = {
+            "selector": selector,
+            "maxElements": max_elements,
+            "elementTypes": element_types or ['*'],
+            "attributes": attributes or ['class', 'href', 'src', 'alt', 'title', 'role', 'aria-label'],
+            "maxDepth": max_depth
+        }
+        
+        try:
+            await self._ensure_bundle()
+            
+            # Pass parameters as a single object
+            result = await self.page.evaluate("(params) => window.__inspector.inspectPage(params)", params)
+            
+            if 'error' in result:
+                logger.error("Page analysis error: %s", result['error'])
+            else:
+                logger.debug("Analyzed %s elements", result['totalElements'])
+                
+            return result
+            
+        except Exception as e:
+            logger.error("Page analysis failed: %s", e)
+            return {'error': str(e)}
+    
+    async def find_clickable_elements(self, max_elements: int = 50) -> Dict[str, Any]:
         """
+        Find all clickable elements on the page.
+        
+        Args:
+            max_elements: Maximum number of elements to return
+            
+        Returns:
+            Dict containing clickable elements info
+        """
+        params = {"maxElements": max_elements}
+        
+        try:
+            await self._ensure_bundle()
+            result = await self.page.evaluate("(params) => window.__inspector.clickableElements(params)", params)
+            logger.debug("Found %s clickable elements", result['totalElements'])
+            return result
+            
+        except Exception as e:
+            logger.error("Failed to find clickable elements: %s", e)
+            return {'error': str(e)}
+    
+    async def find_form_elements(self, max_elements: int = 50) -> Dict[str, Any]:
+        """
+        Find all form input elements on the page.
+        
+        Args:
+            max_elements: Maximum number of elements to return
+            
+        Returns:
+            Dict containing form elements info
+        """
+        params = {"maxElements": max_elements}
         
         try:
-            result = await self.page.evaluate(script, params)
-            logger.debug(f"Found {result['totalElements']} form elements")
+            await self._ensure_bundle()
+            result = await self.page.evaluate("(params) => window.__inspector.formElements(params)", params)
+            logger.debug("Found %s form elements", result['totalElements'])
             return result
             
         except Exception as e:
-            logger.error(f"Failed to find form elements: {str(e)}")
+            logger.error("Failed to find form elements: %s", e)
             return {'error': str(e)}
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""Helpers for JavaScript snippets sent to the browser."""
+import re
+
+_LINE_COMMENT = re.compile(r'^\s*//.*$', re.MULTILINE)
+_WHITESPACE = re.compile(r'\s+')
+
+def minify_js(source: str) -> str:
+    """
+    Strip full-line comments and collapse whitespace in a JS snippet.
+    
+    Only suitable for scripts that terminate statements with semicolons and
+    have no whitespace-sensitive string literals.
+    
+    Args:
+        source: JavaScript source
+        
+    Returns:
+        str: Minified source
+    """
+    return _WHITESPACE.sub(' ', _LINE_COMMENT.sub('', source)).strip()
@@ -1,18 +1,43 @@
 """Logging utilities for browser automation."""
+import asyncio
+import functools
+import itertools
 import logging
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional, Set, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None
+
+LOG_DIR = Path.home() / '.goose/logs/browser_automation'
+
+@functools.lru_cache(maxsize=None)
+def _ensure_log_dir() -> Path:
+    """Create the log directory on first use; later loggers reuse it as is."""
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    return LOG_DIR
+
+def _dump_json(data: Any) -> bytes:
+    """Serialize debug data as indented JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
 
 class DebugLogger:
     """Debug logging utility for browser automation."""
     
+    # Orders saved page states within a process; timestamps alone collide
+    # when several states are saved in the same second
+    _seq = itertools.count()
+    
     def __init__(self):
         """Initialize debug logger."""
-        # Create logs directory
-        self.log_dir = Path.home() / '.goose/logs/browser_automation'
-        self.log_dir.mkdir(parents=True, exist_ok=True)
+        # Logs directory, created once per process
+        self.log_dir = _ensure_log_dir()
         
         # Set up logger
         self.logger = logging.getLogger('browser_automation')
@@ -21,6 +46,12 @@ class DebugLogger:
         # Remove any existing handlers
         self.logger.handlers = []
         
+        # Deferred page state files, written together by flush()
+        self._pending: List[Tuple[Path, Union[str, bytes]]] = []
+        
+        # Captures started by save_page_state_nowait, awaited by flush()
+        self._tasks: Set[asyncio.Task] = set()
+        
         # Create handlers
         self._setup_handlers()
         
@@ -50,51 +81,101 @@ class DebugLogger:
         self.logger.addHandler(fh)
         self.logger.addHandler(ch)
         
-    async def save_page_state(self, page, name: str):
+    async def save_page_state(self, page, name: str, defer: bool = False):
         """
         Save complete page state for debugging.
         
         Args:
             page: Playwright page object
             name: Name prefix for saved files
+            defer: Capture now but queue the files for flush() instead of
+                writing them, keeping disk I/O out of a timed flow
         """
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        base_name = f"{name}_{timestamp}"
+        base_name = f"{name}_{timestamp}_{next(self._seq):04d}"
         
         try:
-            # Save screenshot
+            # Screenshot and page state are independent, so capture them together;
+            # the state is read in one round-trip
             screenshot_path = self.log_dir / f"{base_name}_screenshot.png"
-            await page.screenshot(path=str(screenshot_path))
-            
-            # Save page content
-            content_path = self.log_dir / f"{base_name}_content.html"
-            content = await page.content()
-            content_path.write_text(content)
+            screenshot, state = await asyncio.gather(
+                page.screenshot(path=None if defer else str(screenshot_path)),
+                page.evaluate("""() => ({
+                    content: (document.doctype ? new XMLSerializer().serializeToString(document.doctype) : '') +
+                        document.documentElement.outerHTML,
+                    consoleLogs: window.consoleLog || []
+                })""")
+            )
             
-            # Save page information
+            # Save page information; url and viewport are known locally
             info = {
                 'url': page.url,
-                'viewport': await page.viewport_size(),
+                'viewport': page.viewport_size,
                 'timestamp': timestamp
             }
             
-            # Add console logs if available
-            console_logs = await page.evaluate("""() => {
-                return window.consoleLog || [];
-            }""")
+            if state['consoleLogs']:
+                info['console_logs'] = state['consoleLogs']
+                
+            files = [
+                (self.log_dir / f"{base_name}_content.html", state['content']),
+                (self.log_dir / f"{base_name}_info.json", _dump_json(info))
+            ]
             
-            if console_logs:
-                info['console_logs'] = console_logs
+            if defer:
+                files.append((screenshot_path, screenshot))
+                self._pending.extend(files)
+                self.logger.debug("Page state queued: %s", base_name)
+                return
                 
-            # Save info
-            info_path = self.log_dir / f"{base_name}_info.json"
-            info_path.write_text(json.dumps(info, indent=2))
+            await self._write_files(files)
+            self.logger.info("Page state saved: %s", base_name)
             
-            self.logger.info(f"Page state saved: {base_name}")
+        except Exception as e:
+            self.logger.error("Failed to save page state: %s", e)
             
+    def save_page_state_nowait(self, page, name: str) -> asyncio.Task:
+        """
+        Start saving page state in the background and return immediately.
+        
+        The capture overlaps with whatever the caller does next, so it may
+        reflect a slightly later page state. flush() waits for it to finish.
+        
+        Args:
+            page: Playwright page object
+            name: Name prefix for saved files
+            
+        Returns:
+            asyncio.Task: The running capture
+        """
+        task = asyncio.create_task(self.save_page_state(page, name))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+        
+    async def flush(self):
+        """Wait for background captures, then write all page states queued with defer=True."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+            
+        try:
+            await self._write_files(pending)
+            self.logger.info("Flushed %d debug files", len(pending))
         except Exception as e:
-            self.logger.error(f"Failed to save page state: {str(e)}")
+            self.logger.error("Failed to flush page states: %s", e)
             
+    @staticmethod
+    async def _write_files(files: List[Tuple[Path, Union[str, bytes]]]):
+        """Write text and binary files off the event loop, concurrently."""
+        await asyncio.gather(*(
+            asyncio.to_thread(path.write_text if isinstance(data, str) else path.write_bytes, data)
+            for path, data in files
+        ))
+        
     def get_latest_log(self) -> Optional[str]:
         """Get path to latest log file."""
         try:
@@ -102,5 +183,5 @@ class DebugLogger:
             if logs:
                 return str(sorted(logs)[-1])
         except Exception as e:
-            self.logger.error(f"Failed to get latest log: {str(e)}")
+            self.logger.error("Failed to get latest log: %s", e)
         return None
\ No newline at end of file
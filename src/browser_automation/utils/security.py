@@ -1,10 +1,15 @@
 """Security utilities for browser automation."""
+import asyncio
 import logging
 from typing import Optional, Dict, Any
 from playwright.async_api import Page, Response
+from playwright.async_api import TimeoutError as PWTimeout
 
 logger = logging.getLogger(__name__)
 
+# How long to wait for a cookie consent banner that may never appear
+COOKIE_CONSENT_TIMEOUT = 2000
+
 class SecurityUtils:
     """Utilities for handling security-related tasks."""
     
@@ -12,14 +17,13 @@ class SecurityUtils:
         self.page = page
         
     async def setup_request_interception(self):
-        """Setup request interception for security headers."""
-        await self.page.route("**/*", self._handle_request)
+        """
+        Setup security headers for all requests.
         
-    async def _handle_request(self, route, request):
-        """Handle intercepted requests."""
-        # Add security headers
-        headers = {
-            **request.headers,
+        Headers are applied by the browser itself, so requests are not
+        paused and routed through Python one by one.
+        """
+        await self.page.set_extra_http_headers({
             'X-Requested-With': 'XMLHttpRequest',
             'Accept': 'application/json, text/plain, */*',
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
@@ -31,10 +35,7 @@ class SecurityUtils:
             'Sec-Fetch-Site': 'none',
             'Sec-Fetch-User': '?1',
             'Upgrade-Insecure-Requests': '1'
-        }
-        
-        # Continue with modified headers
-        await route.continue_(headers=headers)
+        })
         
     async def bypass_recaptcha(self) -> bool:
         """
@@ -75,7 +76,7 @@ class SecurityUtils:
             return True
             
         except Exception as e:
-            logger.error(f"Error bypassing reCAPTCHA: {str(e)}")
+            logger.error("Error bypassing reCAPTCHA: %s", e)
             return False
             
     async def handle_cookie_consent(self) -> bool:
@@ -86,7 +87,7 @@ class SecurityUtils:
             bool: True if handled or not present, False if failed to handle
         """
         try:
-            # Check for OneTrust banner
+            # No OneTrust banner is the common case; one probe settles it
             has_banner = await self.page.evaluate("""() => {
                 return document.querySelector('#onetrust-banner-sdk') !== null;
             }""")
@@ -94,21 +95,30 @@ class SecurityUtils:
             if not has_banner:
                 return True
                 
-            # Accept cookies
-            await self.page.evaluate("""() => {
-                const acceptBtn = document.querySelector('#accept-recommended-btn-handler');
-                if (acceptBtn) acceptBtn.click();
-            }""")
-            
-            # Wait for banner to disappear
-            await self.page.wait_for_function("""() => {
-                return document.querySelector('#onetrust-banner-sdk') === null;
-            }""")
-            
+            # The banner animates in, so give its accept button a bounded
+            # window to become clickable
+            try:
+                await self.page.locator('#accept-recommended-btn-handler').click(
+                    timeout=COOKIE_CONSENT_TIMEOUT
+                )
+                logger.debug("Accepted cookie consent banner")
+            except PWTimeout:
+                logger.warning("Cookie consent banner present but not accepted")
+                return False
+                
+            # Let the banner finish closing so it cannot intercept the next
+            # click; OneTrust hides it rather than always removing it
+            try:
+                await self.page.locator('#onetrust-banner-sdk').wait_for(
+                    state='hidden', timeout=COOKIE_CONSENT_TIMEOUT
+                )
+            except PWTimeout:
+                logger.debug("Cookie consent banner still visible after accepting")
+                
             return True
             
         except Exception as e:
-            logger.error(f"Error handling cookie consent: {str(e)}")
+            logger.error("Error handling cookie consent: %s", e)
             return False
             
     async def setup_security_headers(self):
@@ -162,7 +172,7 @@ class SecurityUtils:
             return True
             
         except Exception as e:
-            logger.error(f"Error bypassing security checks: {str(e)}")
+            logger.error("Error bypassing security checks: %s", e)
             return False
             
     async def wait_for_navigation_with_security(self, url: str) -> Optional[Response]:
@@ -176,30 +186,55 @@ class SecurityUtils:
             Response object if successful, None otherwise
         """
         try:
-            # Setup security
-            await self.setup_security_headers()
-            await self.bypass_security_checks()
+            # Setup security; headers and the bypass script are independent
+            await asyncio.gather(
+                self.setup_security_headers(),
+                self.bypass_security_checks()
+            )
             
-            # Navigate to page
+            # Navigate to page; networkidle would add seconds of tracker
+            # traffic, so readiness is checked with bounded waits below
             response = await self.page.goto(
                 url,
-                wait_until='networkidle',
+                wait_until='domcontentloaded',
                 timeout=60000
             )
             
             if not response:
                 return None
                 
+            # Wait for page to be fully loaded before handling challenges; the
+            # consent banner and reCAPTCHA badge are injected by scripts that
+            # run after DOMContentLoaded. The load-state waits are skipped when
+            # a single probe shows the page already is loaded (a complete
+            # readyState implies images have loaded).
+            state = await self.page.evaluate("""() => ({
+                readyState: document.readyState,
+                loading: !!document.querySelector('[class*="loading"], [class*="spinner"]')
+            })""")
+            
+            if not (state['readyState'] == 'complete' and not state['loading']):
+                # Best effort: a page that never goes idle still navigated fine.
+                # Both waits always run to completion so neither is left pending.
+                results = await asyncio.gather(
+                    self.page.wait_for_load_state('load', timeout=2000),
+                    self.page.wait_for_load_state('networkidle', timeout=2000),
+                    return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, PWTimeout):
+                        logger.debug("Load state wait timed out for %s", url)
+                    elif isinstance(result, Exception):
+                        raise result
+                    
             # Handle security challenges
-            await self.handle_cookie_consent()
-            await self.bypass_recaptcha()
-            
-            # Wait for page to be fully loaded
-            await self.page.wait_for_load_state('domcontentloaded')
-            await self.page.wait_for_load_state('networkidle')
+            await asyncio.gather(
+                self.handle_cookie_consent(),
+                self.bypass_recaptcha()
+            )
             
             return response
             
         except Exception as e:
-            logger.error(f"Error during secure navigation: {str(e)}")
+            logger.error("Error during secure navigation: %s", e)
             return None
\ No newline at end of file
@@ -35,6 +35,7 @@ class GoogleSelectors:
         'featured_snippet': '.c2xzTb',             # Featured snippet box
         'knowledge_panel': '.kp-wholepage',        # Knowledge panel
         'related_searches': '.gGQDvf',            # Related searches section
+        'result_titles': 'h3',                    # Result title headings
         
         # Navigation
         'next_page': '#pnnext',                   # Next page button
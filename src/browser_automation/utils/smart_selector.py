@@ -1,16 +1,173 @@
 """Smart selector strategies for dynamic web content."""
-from typing import List, Dict, Any, Optional
+import asyncio
+import weakref
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 from playwright.async_api import Page, Locator
+from browser_automation.utils.js import minify_js
 
 logger = logging.getLogger(__name__)
 
+# Single tree walk collecting elements that match the search criteria
+FIND_CANDIDATES_SCRIPT = minify_js("""
+(params) => {
+    const matches = [];
+    const wanted = params.attributes;
+    const root = (params.root && document.querySelector(params.root)) || document.documentElement;
+    
+    // Links come straight from the tag index; anything else needs a walk
+    let next;
+    if (params.element_type === 'link') {
+        const links = root.getElementsByTagName('a');
+        let i = 0;
+        next = () => links[i++];
+    } else {
+        const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT);
+        let started = false;
+        next = () => {
+            if (started) return walker.nextNode();
+            started = true;
+            return walker.currentNode;
+        };
+    }
+    
+    for (let el = next(); el; el = next()) {
+        if (params.max_candidates !== null && matches.length >= params.max_candidates) break;
+        
+        // Cheapest checks first: tag, then layout, then text and style
+        if (params.element_type === 'link' && el.tagName !== 'A') continue;
+        
+        // Skip hidden elements
+        if (!el.offsetParent) continue;
+        
+        const text = el.textContent?.trim();
+        if (params.target_text && !text?.includes(params.target_text)) continue;
+        
+        const isClickable = !!(
+            el.tagName === 'A' ||
+            el.tagName === 'BUTTON' ||
+            el.onclick ||
+            el.getAttribute('role') === 'button' ||
+            window.getComputedStyle(el).cursor === 'pointer'
+        );
+        if (params.element_type === 'button' && !isClickable) continue;
+        
+        const attrs = {};
+        for (let i = 0; i < wanted.length; i++) {
+            const value = el.getAttribute(wanted[i]);
+            if (value !== null) {
+                attrs[wanted[i]] = value;
+            }
+        }
+        
+        matches.push({
+            tag: el.tagName.toLowerCase(),
+            id: el.id,
+            classes: Array.from(el.classList),
+            attributes: attrs,
+            text: text,
+            isClickable,
+            position: el.getBoundingClientRect().toJSON()
+        });
+    }
+    return matches;
+}
+""")
+
+# Match count and first-match visibility for every selector in one pass.
+# null marks selectors the DOM cannot parse (Playwright-only syntax such as
+# :has-text), which are left to Playwright's own engines.
+PROBE_SELECTORS_SCRIPT = minify_js("""
+selectors => selectors.map(selector => {
+    let matches;
+    try {
+        matches = document.querySelectorAll(selector);
+    } catch (e) {
+        return null;
+    }
+    
+    const el = matches[0];
+    if (!el) return {count: 0, visible: false};
+    
+    const style = window.getComputedStyle(el);
+    return {
+        count: matches.length,
+        visible: !!(
+            el.offsetWidth &&
+            el.offsetHeight &&
+            style.display !== 'none' &&
+            style.visibility !== 'hidden' &&
+            style.opacity !== '0'
+        )
+    };
+})
+""")
+
+# Both helpers installed once per page as window.__smartSelector, so each
+# lookup ships a short call instead of the full source
+SMART_SELECTOR_BUNDLE = (
+    "(() => { window.__smartSelector = window.__smartSelector || "
+    f"{{findCandidates: {FIND_CANDIDATES_SCRIPT}, probeSelectors: {PROBE_SELECTORS_SCRIPT}}}; }})();"
+)
+
+# Pages that already have SMART_SELECTOR_BUNDLE registered
+_bundled_pages: "weakref.WeakSet[Page]" = weakref.WeakSet()
+
+# Highest score _score_selector can award: a unique, visible, plain ID selector
+MAX_SELECTOR_SCORE = 150
+
+@lru_cache(maxsize=256)
+def _build_selector_strategies(tag: str,
+                               element_id: str,
+                               classes: Tuple[str, ...],
+                               attributes: Tuple[Tuple[str, str], ...],
+                               text: str) -> Tuple[str, ...]:
+    """Build candidate selectors for an element, most reliable first."""
+    selectors = []
+    
+    # Strategy 1: ID-based selector (most reliable)
+    if element_id:
+        selectors.append(f"#{element_id}")
+        selectors.append(f'textarea#{element_id}')
+        
+    # Strategy 2: Attribute-based selectors
+    for name, value in attributes:
+        if name not in ["id", "class"] and value:
+            # Handle special characters in attribute values
+            value = value.replace('"', '\\"')
+            selectors.append(f'{tag}[{name}="{value}"]')
+            
+    # Strategy 3: Class-based selectors
+    if classes:
+        class_selector = f'{tag}.{".".join(classes)}'
+        selectors.append(class_selector)
+        
+    # Strategy 4: Text-based selector, resolved by Playwright's text engine
+    # rather than native CSS matching, so it is tried last
+    if text:
+        # Escape special characters in text
+        text = text.replace('"', '\\"')
+        selectors.append(f'{tag}:has-text("{text}")')
+        
+    return tuple(selectors)
+
 class SmartSelector:
     """Dynamic selector builder with multiple strategies."""
     
     def __init__(self, page: Page):
         """Initialize with Playwright page object."""
         self.page = page
+        
+    async def _ensure_bundle(self) -> None:
+        """Install the selector helpers on the page if not already present."""
+        if self.page in _bundled_pages:
+            return
+            
+        # Init script covers future documents, evaluate covers the current one
+        await self.page.add_init_script(SMART_SELECTOR_BUNDLE)
+        await self.page.evaluate(SMART_SELECTOR_BUNDLE)
+        _bundled_pages.add(self.page)
     
     async def find_element(self, 
                           target_text: Optional[str] = None,
@@ -63,6 +220,37 @@ class SmartSelector:
         Returns:
             Most reliable CSS selector for the element
         """
+        match = await self.find_best_match(
+            target_text=target_text,
+            target_index=target_index,
+            element_type=element_type,
+            context=context,
+            attributes=attributes
+        )
+        return match[0] if match else None
+        
+    async def find_best_match(self, 
+                            target_text: Optional[str] = None,
+                            target_index: Optional[int] = None,
+                            element_type: Optional[str] = None,
+                            context: str = "document",
+                            attributes: Optional[List[str]] = None) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Find the most reliable selector along with the element it was built for.
+        
+        The element description carries the requested attributes as read during
+        the candidate search, so callers can check them without querying again.
+        
+        Args:
+            target_text: Text content to match
+            target_index: Index of the element (1-based)
+            element_type: Type of element to look for (e.g., 'link', 'button')
+            context: Context to search in (e.g., 'search-results', 'navigation')
+            attributes: List of attributes to include in element analysis
+            
+        Returns:
+            Tuple of the selector and the element description, None if not found
+        """
         # Get candidate elements based on initial criteria
         candidates = await self._find_candidate_elements(
             target_text=target_text,
@@ -73,19 +261,24 @@ class SmartSelector:
         )
         
         if not candidates:
-            logger.debug(f"No candidates found for text={target_text}, index={target_index}")
+            logger.debug("No candidates found for text=%s, index=%s", target_text, target_index)
             return None
             
-        # Generate selector strategies for each candidate
+        # Generate selector strategies for each candidate, remembering which
+        # candidate each one came from
         selectors = []
+        owners = []
         for candidate in candidates:
-            selector_strategies = await self._generate_selector_strategies(candidate)
+            selector_strategies = self._generate_selector_strategies(candidate)
             selectors.extend(selector_strategies)
+            owners.extend([candidate] * len(selector_strategies))
             
         # Test and rank selectors
         best_selector = await self._find_most_reliable_selector(selectors)
-        
-        return best_selector
+        if best_selector is None:
+            return None
+            
+        return best_selector, owners[selectors.index(best_selector)]
     
     async def _find_candidate_elements(self,
                                      target_text: Optional[str] = None,
@@ -103,58 +296,18 @@ class SmartSelector:
         if context == "search-results":
             inspection_params["selector"] = "#search"
             
-        # Get elements from the page
-        elements = await self.page.evaluate("""
-        (params) => {
-            const findMatchingElements = () => {
-                const matches = [];
-                const elements = document.querySelectorAll('*');
-                
-                for (const el of elements) {
-                    // Skip hidden elements
-                    if (!el.offsetParent) continue;
-                    
-                    const text = el.textContent?.trim();
-                    const isClickable = (
-                        el.tagName === 'A' ||
-                        el.tagName === 'BUTTON' ||
-                        el.onclick ||
-                        el.getAttribute('role') === 'button' ||
-                        window.getComputedStyle(el).cursor === 'pointer'
-                    );
-                    
-                    if (params.target_text && !text?.includes(params.target_text)) continue;
-                    if (params.element_type === 'link' && el.tagName !== 'A') continue;
-                    if (params.element_type === 'button' && !isClickable) continue;
-                    
-                    const attrs = {};
-                    if (params.attributes) {
-                        for (const attr of el.attributes) {
-                            if (params.attributes.includes(attr.name)) {
-                                attrs[attr.name] = attr.value;
-                            }
-                        }
-                    }
-                    
-                    matches.push({
-                        tag: el.tagName.toLowerCase(),
-                        id: el.id,
-                        classes: Array.from(el.classList),
-                        attributes: attrs,
-                        text: text,
-                        isClickable,
-                        position: el.getBoundingClientRect().toJSON()
-                    });
-                }
-                return matches;
-            };
-            
-            return findMatchingElements();
-        }
-        """, {
+        # Get elements from the page in a single tree walk, only as far as
+        # needed to reach the requested index. Without one the walk is not
+        # capped: text matches arrive in document order, so wrappers like body
+        # and layout divs come before a nested target and would crowd it out
+        # of any fixed-size list.
+        await self._ensure_bundle()
+        elements = await self.page.evaluate("(params) => window.__smartSelector.findCandidates(params)", {
             "target_text": target_text,
             "element_type": element_type,
-            "attributes": attributes or []
+            "attributes": attributes or [],
+            "max_candidates": target_index,
+            "root": inspection_params.get("selector")
         })
         
         # Filter by index if specified
@@ -163,73 +316,70 @@ class SmartSelector:
             
         return elements
         
-    async def _generate_selector_strategies(self, element: Dict[str, Any]) -> List[str]:
+    def _generate_selector_strategies(self, element: Dict[str, Any]) -> List[str]:
         """Generate multiple possible selectors for an element."""
-        selectors = []
-        
-        # Strategy 1: ID-based selector (most reliable)
-        if element["id"]:
-            selectors.append(f"#{element['id']}")
-            selectors.append(f'textarea#{element["id"]}')
-            
-        # Strategy 2: Attribute-based selectors
-        for name, value in element["attributes"].items():
-            if name not in ["id", "class"] and value:
-                # Handle special characters in attribute values
-                value = value.replace('"', '\\"')
-                selectors.append(f'{element["tag"]}[{name}="{value}"]')
-                
-        # Strategy 3: Class-based selectors
-        if element["classes"]:
-            class_selector = f'{element["tag"]}.{".".join(element["classes"])}'
-            selectors.append(class_selector)
-            
-        # Strategy 4: Text-based selector
-        if element["text"]:
-            # Escape special characters in text
-            text = element["text"].replace('"', '\\"')
-            selectors.append(f'{element["tag"]}:has-text("{text}")')
-            
-        # Strategy 5: Position-based selector (last resort)
-        if element["position"]:
-            pos = element["position"]
-            selectors.append(
-                f'{element["tag"]}:where(not([style*="display: none"])'
-                f':not([style*="visibility: hidden"])'
-                f':not([style*="opacity: 0"])):nth-of-type({pos})'
-            )
-            
-        return selectors
+        return list(_build_selector_strategies(
+            element["tag"],
+            element["id"],
+            tuple(element["classes"]),
+            tuple(element["attributes"].items()),
+            element["text"]
+        ))
         
     async def _find_most_reliable_selector(self, selectors: List[str]) -> Optional[str]:
         """Test selectors and find the most reliable one."""
         if not selectors:
             return None
             
+        # Count and check visibility for every CSS selector in one round-trip
+        await self._ensure_bundle()
+        probes = await self.page.evaluate(
+            "(selectors) => window.__smartSelector.probeSelectors(selectors)",
+            selectors
+        )
+        
+        # Selectors only Playwright understands are probed through locators
+        fallback = [selector for selector, probe in zip(selectors, probes) if probe is None]
+        if fallback:
+            results = await asyncio.gather(
+                *(self._probe_locator(selector) for selector in fallback),
+                return_exceptions=True
+            )
+            fallback_probes = dict(zip(fallback, results))
+            probes = [probe if probe is not None else fallback_probes[selector]
+                      for selector, probe in zip(selectors, probes)]
+            
         best_selector = None
         best_score = -1
         
-        for selector in selectors:
-            try:
-                # Test selector uniqueness
-                elements = await self.page.query_selector_all(selector)
-                if not elements:
-                    continue
-                    
-                # Score the selector
-                score = await self._score_selector(selector, len(elements))
-                
-                if score > best_score:
-                    best_score = score
-                    best_selector = selector
-                    
-            except Exception as e:
-                logger.debug(f"Selector test failed for {selector}: {str(e)}")
+        for selector, probe in zip(selectors, probes):
+            if isinstance(probe, Exception):
+                logger.debug("Selector test failed for %s: %s", selector, probe)
                 continue
+            if not probe["count"]:
+                continue
+                
+            # Score the selector
+            score = self._score_selector(selector, probe["count"], probe["visible"])
+            
+            if score > best_score:
+                best_score = score
+                best_selector = selector
+                
+            # Nothing later in the list can outscore this one
+            if best_score >= MAX_SELECTOR_SCORE:
+                break
                 
         return best_selector
         
-    async def _score_selector(self, selector: str, match_count: int) -> float:
+    async def _probe_locator(self, selector: str) -> Dict[str, Any]:
+        """Match count and first-match visibility for a Playwright selector."""
+        locator = self.page.locator(selector)
+        count = await locator.count()
+        visible = bool(count) and await locator.first.is_visible()
+        return {"count": count, "visible": visible}
+        
+    def _score_selector(self, selector: str, match_count: int, is_visible: bool) -> float:
         """
         Score a selector based on various factors.
         
@@ -239,43 +389,21 @@ class SmartSelector:
         - Reliability (ID > attributes > classes > position)
         - Visibility of matched elements
         """
-        try:
-            base_score = 100
-            
-            # Penalize for multiple matches
-            if match_count > 1:
-                base_score -= (match_count - 1) * 10
-                
-            # Bonus for ID-based selectors
-            if selector.startswith('#'):
-                base_score += 50
-                
-            # Penalty for complex selectors
-            base_score -= selector.count(' ') * 5
-            base_score -= selector.count('[') * 3
+        base_score = 100
+        
+        # Penalize for multiple matches
+        if match_count > 1:
+            base_score -= (match_count - 1) * 10
             
-            # Check if element is visible
-            is_visible = await self.page.evaluate(f"""
-                selector => {{
-                    const el = document.querySelector(selector);
-                    if (!el) return false;
-                    
-                    const style = window.getComputedStyle(el);
-                    return !!(
-                        el.offsetWidth &&
-                        el.offsetHeight &&
-                        style.display !== 'none' &&
-                        style.visibility !== 'hidden' &&
-                        style.opacity !== '0'
-                    );
-                }}
-            """, selector)
+        # Bonus for ID-based selectors
+        if selector.startswith('#'):
+            base_score += 50
             
-            if not is_visible:
-                base_score -= 30
-                
-            return max(0, base_score)
+        # Penalty for complex selectors
+        base_score -= selector.count(' ') * 5
+        base_score -= selector.count('[') * 3
+        
+        if not is_visible:
+            base_score -= 30
             
-        except Exception as e:
-            logger.debug(f"Scoring failed for {selector}: {str(e)}")
-            return 0
\ No newline at end of file
+        return max(0, base_score)
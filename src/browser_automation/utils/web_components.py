@@ -1,51 +1,207 @@
 """Utilities for handling web components and shadow DOM."""
+import asyncio
 import logging
+import re
+import weakref
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 from playwright.async_api import Page, ElementHandle, TimeoutError
+from browser_automation.utils.js import minify_js
 
 logger = logging.getLogger(__name__)
 
+# Leading type selector of a CSS selector when it is a custom element name
+# (a letter first, then a hyphen somewhere); whenDefined rejects anything else
+CUSTOM_ELEMENT_TAG = re.compile(r'^\s*([a-zA-Z][\w]*-[\w-]*)(?![\w-])')
+
+# Whether a custom element tag is registered, waiting on its definition
+# event (not polling) for up to the given time if it is not yet
+CUSTOM_ELEMENT_DEFINED_SCRIPT = """
+([tag, timeout]) => {
+    if (customElements.get(tag) !== undefined) return true;
+    return Promise.race([
+        customElements.whenDefined(tag).then(() => true),
+        new Promise((resolve) => setTimeout(() => resolve(false), timeout))
+    ]);
+}
+"""
+
+# Whether every listed custom element tag is registered, waiting on their
+# definition events together for up to the given time
+COMPONENTS_DEFINED_SCRIPT = """
+([tags, timeout]) => {
+    const pending = tags
+        .map((tag) => tag.toLowerCase())
+        .filter((tag) => customElements.get(tag) === undefined);
+    if (!pending.length) return true;
+    return Promise.race([
+        Promise.all(pending.map((tag) => customElements.whenDefined(tag))).then(() => true),
+        new Promise((resolve) => setTimeout(() => resolve(false), timeout))
+    ]);
+}
+"""
+
+# How long a native fill waits for the input inside a defined component
+SHADOW_FILL_TIMEOUT = 5000
+
+# Whether an element hosts an open shadow root
+HAS_SHADOW_ROOT_SCRIPT = """
+(element) => {
+    return element.shadowRoot !== null;
+}
+"""
+
+# First match for a selector inside an element's shadow root
+SHADOW_QUERY_SCRIPT = """
+(element, selector) => {
+    return element.shadowRoot.querySelector(selector);
+}
+"""
+
+# Click a button inside a component's shadow root
+CLICK_SHADOW_BUTTON_SCRIPT = minify_js("""
+(component, buttonSelector) => {
+    const button = component.shadowRoot.querySelector(buttonSelector);
+    if (!button) return false;
+    
+    // Simulate click
+    button.click();
+    return true;
+}
+""")
+
+# Click a submit button, looked up in a component's shadow root first and
+# then in the document
+SUBMIT_SHADOW_SCRIPT = minify_js("""
+(component, buttonSelector) => {
+    const button = component.shadowRoot.querySelector(buttonSelector) ||
+        document.querySelector(buttonSelector);
+    if (!button) return false;
+    
+    button.click();
+    return true;
+}
+""")
+
+# Read a property from the first component matching a selector
+COMPONENT_PROPERTY_SCRIPT = """
+([selector, prop]) => {
+    const component = document.querySelector(selector);
+    if (!component) return null;
+    return component[prop];
+}
+"""
+
+# Shadow DOM form helpers installed once per page as window.__webComponents;
+# each click or submit is then a short call instead of shipping the full source
+WEB_COMPONENTS_BUNDLE = (
+    "(() => { window.__webComponents = window.__webComponents || "
+    f"{{click: {CLICK_SHADOW_BUTTON_SCRIPT}, submit: {SUBMIT_SHADOW_SCRIPT}}}; }})();"
+)
+
+# Pages that already have WEB_COMPONENTS_BUNDLE registered
+_bundled_pages: "weakref.WeakSet[Page]" = weakref.WeakSet()
+
+@lru_cache(maxsize=64)
+def _component_state_predicate(state_check: str) -> str:
+    """Build the polling predicate for a state check, once per distinct expression."""
+    return f"""(selector) => {{
+        const component = document.querySelector(selector);
+        if (!component) return false;
+        return {state_check};
+    }}"""
+
 class WebComponentUtils:
     """Utilities for working with web components and shadow DOM."""
     
     def __init__(self, page: Page):
         self.page = page
         
+    async def _ensure_bundle(self) -> None:
+        """Install the shadow DOM helpers on the page if not already present."""
+        if self.page in _bundled_pages:
+            return
+            
+        # Init script covers future documents, evaluate covers the current one
+        await self.page.add_init_script(WEB_COMPONENTS_BUNDLE)
+        await self.page.evaluate(WEB_COMPONENTS_BUNDLE)
+        _bundled_pages.add(self.page)
+        
     async def wait_for_web_component(self, selector: str, timeout: int = 30000) -> Optional[ElementHandle]:
         """
         Wait for a web component to be defined and ready.
         
         Args:
-            selector: Component selector (tag name)
+            selector: Component selector. The definition is only awaited when it
+                starts with a custom element tag name, e.g. ``market-button.primary``.
             timeout: Maximum time to wait in milliseconds
             
         Returns:
             ElementHandle if found, None otherwise
         """
+        match = CUSTOM_ELEMENT_TAG.match(selector)
+        tasks = [asyncio.create_task(self.page.wait_for_selector(selector, timeout=timeout))]
+        if match:
+            # An already upgraded component answers the definition check immediately
+            tasks.append(asyncio.create_task(
+                self.page.evaluate(CUSTOM_ELEMENT_DEFINED_SCRIPT, [match.group(1).lower(), timeout])
+            ))
+            
         try:
-            # Wait for element to be present
-            element = await self.page.wait_for_selector(selector, timeout=timeout)
+            # Wait for the element and its definition together, dropping the
+            # other wait as soon as one of them fails
+            try:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            finally:
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+                        
+            errors = [task.exception() for task in done if task.exception() is not None]
+            if errors:
+                raise errors[0]
+                    
+            element = tasks[0].result()
+            is_defined = tasks[1].result() if match else True
             if not element:
                 return None
                 
-            # Wait for custom element to be defined
-            is_defined = await self.page.evaluate(f"""(selector) => {{
-                return customElements.get(selector.toLowerCase()) !== undefined;
-            }}, "{selector}")""")
-            
             if not is_defined:
-                logger.warning(f"Custom element {selector} not defined")
+                logger.warning("Custom element %s not defined", selector)
                 return None
                 
             return element
             
         except TimeoutError:
-            logger.error(f"Timeout waiting for web component: {selector}")
+            logger.error("Timeout waiting for web component: %s", selector)
             return None
         except Exception as e:
-            logger.error(f"Error waiting for web component: {str(e)}")
+            logger.error("Error waiting for web component: %s", e)
             return None
             
+    async def wait_for_components_defined(self, tags: List[str], timeout: int = 30000) -> bool:
+        """
+        Wait for several custom elements to be defined, without polling.
+        
+        Args:
+            tags: Custom element tag names
+            timeout: Maximum time to wait in milliseconds
+            
+        Returns:
+            bool: True if all are defined, False otherwise
+        """
+        try:
+            defined = await self.page.evaluate(COMPONENTS_DEFINED_SCRIPT, [tags, timeout])
+            
+            if not defined:
+                logger.warning("Custom elements not defined: %s", tags)
+                
+            return defined
+            
+        except Exception as e:
+            logger.error("Error waiting for component definitions: %s", e)
+            return False
+            
     async def get_shadow_element(self, host: ElementHandle, selector: str) -> Optional[ElementHandle]:
         """
         Find an element within a shadow DOM.
@@ -59,26 +215,19 @@ class WebComponentUtils:
         """
         try:
             # Check if element has shadow root
-            has_shadow = await self.page.evaluate("""(element) => {
-                return element.shadowRoot !== null;
-            }""", host)
+            has_shadow = await self.page.evaluate(HAS_SHADOW_ROOT_SCRIPT, host)
             
             if not has_shadow:
-                logger.warning(f"No shadow root found for element")
+                logger.warning("No shadow root found for element")
                 return None
                 
             # Find element in shadow DOM
-            shadow_element = await host.evaluate(f"""(element, selector) => {{
-                return element.shadowRoot.querySelector(selector);
-            }}, "{selector}")""")
+            shadow_handle = await host.evaluate_handle(SHADOW_QUERY_SCRIPT, selector)
             
-            if not shadow_element:
-                return None
-                
-            return shadow_element
+            return shadow_handle.as_element()
             
         except Exception as e:
-            logger.error(f"Error accessing shadow DOM: {str(e)}")
+            logger.error("Error accessing shadow DOM: %s", e)
             return None
             
     async def fill_shadow_input(self, component_selector: str, input_selector: str, value: str) -> bool:
@@ -99,22 +248,16 @@ class WebComponentUtils:
             if not component:
                 return False
                 
-            # Fill input using JavaScript for reliability
-            success = await self.page.evaluate(f"""(component, inputSelector, value) => {{
-                const input = component.shadowRoot.querySelector(inputSelector);
-                if (!input) return false;
-                
-                // Set value and dispatch events
-                input.value = value;
-                input.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                input.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                return true;
-            }}, "{input_selector}", "{value}")""")
+            # Playwright's CSS engine pierces open shadow roots, so the native
+            # fill reaches the inner input and fires the events it expects
+            await self.page.locator(component_selector).locator(input_selector).first.fill(
+                value, timeout=SHADOW_FILL_TIMEOUT
+            )
             
-            return success
+            return True
             
         except Exception as e:
-            logger.error(f"Error filling shadow input: {str(e)}")
+            logger.error("Error filling shadow input: %s", e)
             return False
             
     async def click_shadow_button(self, component_selector: str, button_selector: str) -> bool:
@@ -130,24 +273,66 @@ class WebComponentUtils:
         """
         try:
             # Wait for web component
-            component = await self.wait_for_web_component(component_selector)
+            component, _ = await asyncio.gather(
+                self.wait_for_web_component(component_selector),
+                self._ensure_bundle()
+            )
             if not component:
                 return False
                 
             # Click button using JavaScript for reliability
-            success = await self.page.evaluate(f"""(component, buttonSelector) => {{
-                const button = component.shadowRoot.querySelector(buttonSelector);
-                if (!button) return false;
+            success = await component.evaluate(
+                "(component, selector) => window.__webComponents.click(component, selector)",
+                button_selector
+            )
+            
+            return success
+            
+        except Exception as e:
+            logger.error("Error clicking shadow button: %s", e)
+            return False
+            
+    async def fill_and_click_shadow(self, component_selector: str, input_selector: str, value: str,
+                                    button_selector: str) -> bool:
+        """
+        Fill an input within a shadow DOM and click a submit button.
+        
+        Equivalent to fill_shadow_input followed by click_shadow_button, for
+        form steps such as entering an email and pressing continue. The input
+        is filled natively, like fill_shadow_input, so component bindings see
+        the same events either way.
+        
+        Args:
+            component_selector: Web component selector
+            input_selector: Input selector within shadow DOM
+            value: Value to fill
+            button_selector: Button selector, looked up in the component's shadow
+                DOM first and then in the document
+            
+        Returns:
+            bool: True if both the input and the button were found, False otherwise
+        """
+        try:
+            # Wait for web component
+            component, _ = await asyncio.gather(
+                self.wait_for_web_component(component_selector),
+                self._ensure_bundle()
+            )
+            if not component:
+                return False
                 
-                // Simulate click
-                button.click();
-                return true;
-            }}, "{button_selector}")""")
+            await self.page.locator(component_selector).locator(input_selector).first.fill(
+                value, timeout=SHADOW_FILL_TIMEOUT
+            )
+            success = await component.evaluate(
+                "(component, selector) => window.__webComponents.submit(component, selector)",
+                button_selector
+            )
             
             return success
             
         except Exception as e:
-            logger.error(f"Error clicking shadow button: {str(e)}")
+            logger.error("Error submitting shadow form: %s", e)
             return False
             
     async def wait_for_component_state(self, component_selector: str, state_check: str) -> bool:
@@ -162,17 +347,16 @@ class WebComponentUtils:
             bool: True if state is reached, False otherwise
         """
         try:
-            # Wait for state using polling
-            success = await self.page.wait_for_function(f"""(selector, check) => {{
-                const component = document.querySelector(selector);
-                if (!component) return false;
-                return {state_check};
-            }}, "{component_selector}")""")
+            # Wait for state using polling; state_check is an expression by design
+            success = await self.page.wait_for_function(
+                _component_state_predicate(state_check),
+                arg=component_selector
+            )
             
             return bool(success)
             
         except Exception as e:
-            logger.error(f"Error waiting for component state: {str(e)}")
+            logger.error("Error waiting for component state: %s", e)
             return False
             
     async def get_component_property(self, component_selector: str, property_name: str) -> Any:
@@ -187,14 +371,10 @@ class WebComponentUtils:
             Property value or None if not found
         """
         try:
-            value = await self.page.evaluate(f"""(selector, prop) => {{
-                const component = document.querySelector(selector);
-                if (!component) return null;
-                return component[prop];
-            }}, "{component_selector}", "{property_name}")""")
+            value = await self.page.evaluate(COMPONENT_PROPERTY_SCRIPT, [component_selector, property_name])
             
             return value
             
         except Exception as e:
-            logger.error(f"Error getting component property: {str(e)}")
+            logger.error("Error getting component property: %s", e)
             return None
\ No newline at end of file
@@ -1,9 +1,16 @@
 """Unit tests for browser automation core functionality."""
+import asyncio
+from urllib.parse import quote
+
 import pytest
 from playwright.async_api import Error as PlaywrightError
 
 from browser_automation.controllers.browser_controller import BrowserController
 
+def _html_url(body: str) -> str:
+    """Build a data URL serving the given HTML, so tests need no network."""
+    return 'data:text/html,' + quote(body)
+
 async def test_browser_launch(browser: BrowserController) -> None:
     """Test browser launch and initialization."""
     assert browser.page is not None
@@ -16,6 +23,103 @@ async def test_browser_navigation(browser: BrowserController) -> None:
     assert success is True
     assert 'google.com' in browser.page.url
 
+async def test_navigate_domcontentloaded_skips_readiness_poll(browser: BrowserController) -> None:
+    """Test a domcontentloaded navigation does not wait for loading indicators."""
+    browser.page_load_timeout = 5000
+    loop = asyncio.get_running_loop()
+    
+    start = loop.time()
+    success = await browser.navigate(_html_url('<div class="spinner">Loading</div>'))
+    assert success is True
+    assert loop.time() - start < 2
+
+async def test_navigate_ignores_hidden_loading_indicators(browser: BrowserController) -> None:
+    """Test hidden spinners and templates do not hold back a load navigation."""
+    browser.page_load_timeout = 5000
+    loop = asyncio.get_running_loop()
+    html = (
+        '<div class="spinner" style="display: none"></div>'
+        '<div class="loading-overlay" hidden></div>'
+        '<p>Loaded</p>'
+    )
+    
+    start = loop.time()
+    success = await browser.navigate(_html_url(html), wait_for='load')
+    assert success is True
+    assert loop.time() - start < 2
+
+async def test_navigate_reports_unready_page(browser: BrowserController, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test navigate returns False when the page never becomes ready."""
+    async def never_ready(timeout=None) -> bool:
+        return False
+    monkeypatch.setattr(browser, '_wait_for_page_ready', never_ready)
+    
+    assert await browser.navigate(_html_url('<p>Loaded</p>'), wait_for='load') is False
+
+async def test_reset_session_clears_site_storage(browser: BrowserController) -> None:
+    """Test a reset session keeps no cookies or web storage from the previous one."""
+    url = 'https://session.test/'
+    
+    async def serve(route) -> None:
+        await route.fulfill(body='<p>Signed in</p>', content_type='text/html')
+        
+    await browser.page.route(url, serve)
+    await browser.page.goto(url)
+    await browser.page.evaluate("""() => {
+        localStorage.setItem('token', 'secret');
+        sessionStorage.setItem('token', 'secret');
+        document.cookie = 'session=secret';
+    }""")
+    
+    assert await browser.reset_session() is True
+    
+    await browser.page.route(url, serve)
+    await browser.page.goto(url)
+    stored = await browser.page.evaluate(
+        "() => [localStorage.getItem('token'), sessionStorage.getItem('token'), document.cookie]"
+    )
+    assert stored == [None, None, '']
+
+async def test_result_texts_not_reused_across_documents(browser: BrowserController) -> None:
+    """Test cached result titles are not served for a new document at the same URL."""
+    url = 'https://results.test/'
+    bodies = iter(['<h3>First</h3>', '<h3>Second</h3>'])
+    
+    async def serve(route) -> None:
+        await route.fulfill(body=next(bodies), content_type='text/html')
+        
+    await browser.page.route(url, serve)
+    
+    assert await browser.navigate(url) is True
+    assert await browser.get_result_texts() == ['First']
+    
+    assert await browser.navigate(url) is True
+    assert await browser.get_result_texts() == ['Second']
+
+async def test_relaunch_keeps_one_shared_reference(browser: BrowserController) -> None:
+    """Test launching an already launched controller does not leak a browser reference."""
+    refcount = BrowserController._refcount
+    assert await browser.launch(headless=True) is True
+    assert BrowserController._refcount == refcount
+    assert browser.page is not None
+
+def test_shared_lock_follows_event_loop() -> None:
+    """Test the shared browser lock is recreated for each event loop."""
+    async def current_lock() -> asyncio.Lock:
+        lock = BrowserController._lock()
+        assert BrowserController._lock() is lock
+        return lock
+        
+    assert asyncio.run(current_lock()) is not asyncio.run(current_lock())
+
+async def test_result_texts_refresh_after_attribute_change(browser: BrowserController) -> None:
+    """Test a style change that alters rendered text invalidates the cached titles."""
+    await browser.navigate(_html_url('<h3>First</h3><h3 id="second">Second</h3>'))
+    assert await browser.get_result_texts() == ['First', 'Second']
+    
+    await browser.page.evaluate("() => { document.getElementById('second').style.textTransform = 'uppercase'; }")
+    assert await browser.get_result_texts() == ['First', 'SECOND']
+
 async def test_type_text(browser: BrowserController) -> None:
     """Test typing text into elements."""
     assert browser.page is not None
@@ -37,4 +141,32 @@ async def test_browser_cleanup(browser: BrowserController) -> None:
     await browser.close()
     assert browser._browser is None
     assert browser._page is None
-    assert browser._playwright is None
\ No newline at end of file
+    assert browser._playwright is None
+
+def test_element_state_flags() -> None:
+    """Test readiness flags derived from a raw element probe."""
+    probe = {
+        'rect': {'x': 10, 'y': 10, 'width': 100, 'height': 20},
+        'viewport': {'width': 1280, 'height': 800},
+        'display': 'block',
+        'visibility': 'visible',
+        'opacity': '1',
+        'pointerEvents': 'auto',
+        'disabled': False,
+        'ariaDisabled': False,
+        'hitsElement': True
+    }
+    state = BrowserController._element_state(probe)
+    assert state['visible'] and state['enabled'] and state['inViewport']
+    assert state['ready'] is True
+    
+    # Covered by another element
+    state = BrowserController._element_state({**probe, 'hitsElement': False})
+    assert state['obscured'] is True
+    assert state['ready'] is False
+    
+    # Below the fold is not obscured, just out of viewport
+    offscreen = {**probe, 'rect': {'x': 10, 'y': 900, 'width': 100, 'height': 20}, 'hitsElement': False}
+    state = BrowserController._element_state(offscreen)
+    assert state['inViewport'] is False
+    assert state['obscured'] is False
@@ -0,0 +1,32 @@
+"""Unit tests for smart selector strategy generation."""
+from browser_automation.utils.smart_selector import MAX_SELECTOR_SCORE, SmartSelector, _build_selector_strategies
+
+def test_selector_strategies_order() -> None:
+    """Test strategies are ordered from most to least reliable."""
+    selectors = _build_selector_strategies(
+        'a',
+        'result',
+        ('link', 'primary'),
+        (('href', 'https://example.com'), ('class', 'link primary')),
+        'Example'
+    )
+    
+    assert selectors == (
+        '#result',
+        'textarea#result',
+        'a[href="https://example.com"]',
+        'a.link.primary',
+        'a:has-text("Example")'
+    )
+
+def test_selector_strategies_cached() -> None:
+    """Test identical elements reuse the cached strategy list."""
+    first = _build_selector_strategies('button', '', (), (('role', 'button'),), 'Go')
+    second = _build_selector_strategies('button', '', (), (('role', 'button'),), 'Go')
+    assert first is second
+
+def test_score_selector_uses_probe_results() -> None:
+    """Test scoring from a probed match count and visibility."""
+    selector = SmartSelector(None)
+    assert selector._score_selector('#result', 1, True) == MAX_SELECTOR_SCORE
+    assert selector._score_selector('a[href="x"]', 3, False) == 100 - 20 - 3 - 30